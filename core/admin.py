@@ -3,8 +3,21 @@ from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.urls import reverse
 from django.db import models
+from django.db.models import Func, OuterRef, Subquery
 from django.contrib.admin import SimpleListFilter
 from .models import *
+from .templatetags.images import thumbnail_url
+
+def related_count(queryset, field):
+    '''
+    Annotation counting the rows of queryset whose ``field`` is the outer row.
+    A correlated subquery rather than Count() over a join: no GROUP BY, so the
+    changelist keeps its index order and its paginator count stays simple.
+    '''
+    return Subquery(
+        queryset.filter(**{field: OuterRef('pk')}).order_by().annotate(n=Func('pk', function='COUNT')).values('n'),
+        output_field=models.IntegerField(),
+    )
 
 # Custom Filters
 class ActiveFilter(SimpleListFilter):
@@ -64,13 +77,7 @@ class BaseModelAdmin(admin.ModelAdmin):
     status_icon.short_description = 'Status'
 
 class SingletonModelAdmin(BaseModelAdmin):
-    """Admin for models that should have only one active instance"""
-    
-    def save_model(self, request, obj, form, change):
-        if obj.is_active:
-            # Ensure only one instance is active
-            self.model.objects.exclude(pk=obj.pk).update(is_active=False)
-        super().save_model(request, obj, form, change)
+    """Admin for models that should have only one active instance, see models.ActiveSingleton"""
 
     def get_actions(self, request):
         actions = super().get_actions(request)
@@ -196,7 +203,7 @@ class AboutAdmin(SingletonModelAdmin):
         if obj.avatar:
             return format_html(
                 '<img src="{}" style="width: 50px; height: 50px; border-radius: 50%; object-fit: cover;">',
-                obj.avatar.url
+                thumbnail_url(obj.avatar, obj.avatar_variants)
             )
         return format_html('<span style="color: #999;">No avatar</span>')
     avatar_preview.short_description = 'Avatar'
@@ -214,17 +221,25 @@ class SkillGroupAdmin(BaseModelAdmin):
     list_filter = (ActiveFilter,)
     search_fields = ('title',)
     inlines = [SkillInline]
+
+    def get_queryset(self, request):
+        # Counted in the changelist query rather than twice per row
+        return super().get_queryset(request).annotate(
+            skill_total=related_count(Skill.objects.all(), 'group'),
+            skill_active=related_count(Skill.objects.filter(is_active=True), 'group'),
+        )
     
     def skill_count(self, obj):
-        total = obj.skill_set.count()
-        return format_html('<strong>{}</strong> total', total)
+        return format_html('<strong>{}</strong> total', obj.skill_total)
     skill_count.short_description = 'Total Skills'
+    skill_count.admin_order_field = 'skill_total'
 
     def active_skill_count(self, obj):
-        active = obj.skill_set.filter(is_active=True).count()
+        active = obj.skill_active
         color = 'green' if active > 0 else 'red'
         return format_html('<span style="color: {};">{} active</span>', color, active)
     active_skill_count.short_description = 'Active Skills'
+    active_skill_count.admin_order_field = 'skill_active'
 
 @admin.register(Skill)
 class SkillAdmin(BaseModelAdmin):
@@ -288,15 +303,20 @@ class ProjectAdmin(BaseModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="width: 60px; height: 40px; object-fit: cover; border-radius: 4px;">',
-                obj.image.url
+                thumbnail_url(obj.image, obj.image_variants)
             )
         return format_html('<span style="color: #999;">No image</span>')
     image_preview.short_description = 'Preview'
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            skill_total=related_count(Project.skill.through.objects.all(), 'project'),
+        )
+
     def skill_count(self, obj):
-        count = obj.skill.count()
-        return format_html('<span style="background: #e3f2fd; padding: 2px 6px; border-radius: 12px;">{}</span>', count)
+        return format_html('<span style="background: #e3f2fd; padding: 2px 6px; border-radius: 12px;">{}</span>', obj.skill_total)
     skill_count.short_description = 'Skills'
+    skill_count.admin_order_field = 'skill_total'
 
     def links_available(self, obj):
         links = []
@@ -320,6 +340,12 @@ class ProcessAdmin(BaseModelAdmin):
     list_filter = (ActiveFilter,)
     search_fields = ('description',)
     inlines = [StepInline]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            step_total=related_count(Step.objects.all(), 'process'),
+            step_active=related_count(Step.objects.filter(is_active=True), 'process'),
+        )
     
     def description_preview(self, obj):
         if obj.description:
@@ -328,18 +354,19 @@ class ProcessAdmin(BaseModelAdmin):
     description_preview.short_description = 'Process'
 
     def step_count(self, obj):
-        return obj.steps.all().count()
+        return obj.step_total
     step_count.short_description = 'Total Steps'
+    step_count.admin_order_field = 'step_total'
 
     def active_steps(self, obj):
-        active = obj.steps.filter(is_active=True).count()
-        total = obj.steps.count()
+        active, total = obj.step_active, obj.step_total
         percentage = (active / total * 100) if total > 0 else 0
         color = 'green' if percentage > 50 else 'orange' if percentage > 0 else 'red'
         return format_html(
             f'<span style="color: {color};">{active}/{total}</span>',
         )
     active_steps.short_description = 'Active Steps'
+    active_steps.admin_order_field = 'step_active'
 
 @admin.register(Step)
 class StepAdmin(BaseModelAdmin):
@@ -385,22 +412,26 @@ class GetInTouchAdmin(SingletonModelAdmin):
         }),
     )
     inlines = [InfoItemInline, SocialLinkInline]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            info_total=related_count(InfoItem.objects.all(), 'get_in_touch'),
+            info_active=related_count(InfoItem.objects.filter(is_active=True), 'get_in_touch'),
+            social_total=related_count(SocialLink.objects.all(), 'get_in_touch'),
+            social_active=related_count(SocialLink.objects.filter(is_active=True), 'get_in_touch'),
+        )
     
     def info_summary(self, obj):
-        total = obj.info_items.count()
-        active = obj.info_items.filter(is_active=True).count()
         return format_html(
             '<span style="color: green;">{}</span> / <span style="color: #666;">{}</span> active',
-            active, total
+            obj.info_active, obj.info_total
         )
     info_summary.short_description = 'Info Items'
     
     def social_summary(self, obj):
-        total = obj.social_links.count()
-        active = obj.social_links.filter(is_active=True).count()
         return format_html(
             '<span style="color: green;">{}</span> / <span style="color: #666;">{}</span> active',
-            active, total
+            obj.social_active, obj.social_total
         )
     social_summary.short_description = 'Social Links'
 
@@ -0,0 +1,156 @@
+import json
+import threading
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.fields.files import FieldFile
+from django.http import Http404, HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from .cache import conditional_content, content_stamp
+from .replica import reads_replica
+from .snapshot import load_index_context
+
+# section -> (context key, public fields, {child attr: (output name, public fields)})
+SECTIONS = {
+    'metadata': ('metadata', ('title', 'description', 'keywords', 'logo_charecter'), {}),
+    'hero': ('hero', ('greeting', 'full_name', 'title', 'bio', 'resume_url'), {}),
+    'about': ('about', ('about', 'avatar'), {}),
+    'projects': ('projects', ('id', 'title', 'description', 'image', 'demo_url', 'source_url', 'created'), {
+        'active_skills': ('skills', ('id', 'title')),
+    }),
+    'skills': ('skillgroups', ('id', 'title'), {
+        'active_skills': ('skills', ('id', 'title', 'icon')),
+    }),
+    'process': ('process', ('description',), {
+        'active_steps': ('steps', ('id', 'title', 'description')),
+    }),
+    'blog': ('blog_posts', ('id', 'title', 'slug', 'author', 'created', 'excerpt', 'reading_time'), {}),
+    'achievements': ('achievements', ('id', 'title', 'excerpt', 'award_date'), {}),
+    'contact': ('get_in_touch', ('title', 'description'), {
+        'active_info_items': ('info_items', ('key', 'value', 'link', 'icon')),
+        'active_social_links': ('social_links', ('title', 'link', 'icon')),
+    }),
+    'sections': ('sections', ('about_me', 'projects', 'skills', 'process', 'get_in_touch', 'blog', 'achievements'), {}),
+}
+
+# Encoded responses of the current content version, keyed by (section, fields).
+# Capped because field selections come from the query string.
+MAX_ENCODED = 256
+_encoded = {}
+_encoded_version = None
+_encoded_lock = threading.Lock()
+
+
+class FieldError(ValueError):
+    pass
+
+
+def _value(obj, name):
+    value = getattr(obj, name)
+    if isinstance(value, FieldFile):
+        return value.url if value else None
+    return value
+
+
+def _serialize(obj, fields, children):
+    child_names = {name for name, _ in children.values()}
+    data = {name: _value(obj, name) for name in fields if name not in child_names}
+    for attr, (name, child_fields) in children.items():
+        if name in fields:
+            data[name] = [{f: _value(child, f) for f in child_fields} for child in getattr(obj, attr)]
+    return data
+
+
+def _public_fields(section):
+    _, fields, children = SECTIONS[section]
+    return fields + tuple(name for name, _ in children.values())
+
+
+def _parse_fields(section, raw):
+    """Sparse field selection, e.g. ``fields=title,image``."""
+    available = _public_fields(section)
+    if not raw:
+        return available
+    requested = {f.strip() for f in raw.split(',') if f.strip()}
+    unknown = requested.difference(available)
+    if unknown:
+        raise FieldError(f'Unknown fields for {section}: {", ".join(sorted(unknown))}.')
+    # Canonical order, so equivalent selections share one cache entry.
+    return tuple(f for f in available if f in requested)
+
+
+def serialize_section(context, section, fields):
+    key, _, children = SECTIONS[section]
+    value = context[key]
+    if isinstance(value, list):
+        return [_serialize(obj, fields, children) for obj in value]
+    return _serialize(value, fields, children) if value is not None else None
+
+
+def _encoded_response(request, cache_key, build):
+    """Return the cached encoded body for ``cache_key`` under the current content version."""
+    global _encoded_version
+    version = content_stamp(request)
+    with _encoded_lock:
+        if _encoded_version != version:
+            _encoded.clear()
+            _encoded_version = version
+        body = _encoded.get(cache_key)
+    if body is None:
+        body = json.dumps(build(load_index_context()), cls=DjangoJSONEncoder).encode()
+        with _encoded_lock:
+            if _encoded_version == version and len(_encoded) < MAX_ENCODED:
+                _encoded[cache_key] = body
+    response = HttpResponse(body, content_type='application/json')
+    # Public, read-only content: any frontend may fetch it.
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+def _parse_sections(raw):
+    if not raw:
+        return tuple(SECTIONS)
+    requested = {s.strip() for s in raw.split(',') if s.strip()}
+    unknown = requested.difference(SECTIONS)
+    if unknown:
+        raise FieldError(f'Unknown sections: {", ".join(sorted(unknown))}.')
+    return tuple(s for s in SECTIONS if s in requested)
+
+
+def _bad_request(error):
+    return JsonResponse({'error': str(error)}, status=400)
+
+
+@require_GET
+@conditional_content
+@reads_replica
+def portfolio(request):
+    """
+    Every section in one document. ``sections=hero,projects`` limits the
+    sections and ``fields[projects]=title,image`` selects fields per section.
+    """
+    try:
+        sections = _parse_sections(request.GET.get('sections'))
+        fields = {section: _parse_fields(section, request.GET.get(f'fields[{section}]')) for section in sections}
+    except FieldError as e:
+        return _bad_request(e)
+
+    cache_key = ('portfolio',) + tuple(fields.items())
+    return _encoded_response(request, cache_key, lambda context: {
+        section: serialize_section(context, section, section_fields)
+        for section, section_fields in fields.items()
+    })
+
+
+@require_GET
+@conditional_content
+@reads_replica
+def portfolio_section(request, section):
+    if section not in SECTIONS:
+        raise Http404(f'Unknown section {section!r}.')
+    try:
+        fields = _parse_fields(section, request.GET.get('fields'))
+    except FieldError as e:
+        return _bad_request(e)
+
+    return _encoded_response(request, (section, fields), lambda context: serialize_section(context, section, fields))
@@ -0,0 +1,192 @@
+import functools
+import gzip
+import os
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import condition
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CONTENT_VERSION_KEY = 'core:content-version'
+PAGE_KEY_PREFIX = 'core:page'
+PAGE_TIMEOUT = 60 * 60 * 24
+
+# Preferred first; 'br' is only offered when the brotli package is installed.
+ENCODINGS = ('br', 'gzip')
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def get_content_version():
+    """Return the current content version, creating one if none is stored yet."""
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        cache.add(CONTENT_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+
+def bump_content_version():
+    """Invalidate every page rendered from the previous content version."""
+    version = time.time_ns()
+    cache.set(CONTENT_VERSION_KEY, version, None)
+    return version
+
+
+@functools.cache
+def template_mtime_ns():
+    """Newest template mtime, so a deploy that changes templates invalidates pages."""
+    newest = 0
+    for engine in settings.TEMPLATES:
+        for directory in engine.get('DIRS', []):
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    newest = max(newest, os.stat(os.path.join(root, name)).st_mtime_ns)
+    return newest
+
+
+def content_stamp(request):
+    # Looked up once per request: both condition() callbacks need it.
+    if not hasattr(request, '_content_stamp'):
+        request._content_stamp = (get_content_version(), template_mtime_ns())
+    return request._content_stamp
+
+
+def content_etag(request, *args, **kwargs):
+    version, mtime = content_stamp(request)
+    # Weak: the same version is served in several content encodings.
+    return f'W/"{version:x}-{mtime:x}"'
+
+
+def content_last_modified(request, *args, **kwargs):
+    return datetime.fromtimestamp(max(content_stamp(request)) / 1e9, tz=timezone.utc)
+
+
+def origin_etag(request, *args, **kwargs):
+    # The body holds absolute URLs, so each scheme and host has its own ETag.
+    origin = zlib.crc32(f'{request.scheme}://{request.get_host()}'.encode())
+    return f'{content_etag(request)[:-1]}-{origin:x}"'
+
+
+# Answers If-None-Match / If-Modified-Since with a 304 before the view runs.
+conditional_content = condition(etag_func=content_etag, last_modified_func=content_last_modified)
+# The same, for views whose body depends on the request's origin.
+conditional_origin_content = condition(etag_func=origin_etag, last_modified_func=content_last_modified)
+
+
+def page_cache_stats():
+    """Hit/miss counters of the page cache for this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_page_cache_stats():
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _accepted_encodings(request):
+    accepted = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _, params = part.partition(';')
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _compress(body):
+    """Every encoding of ``body`` we can serve, computed once per content version."""
+    variants = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=11)
+    return variants
+
+
+def _page_key(request, name):
+    version, mtime = content_stamp(request)
+    return f'{PAGE_KEY_PREFIX}:{name}:{version}:{mtime}'
+
+
+def _render_variants(request, template_name, context):
+    _count('misses')
+    body = render_to_string(template_name, context, request=request).encode()
+    return _compress(body)
+
+
+def _page_response(request, variants, content_type):
+    accepted = _accepted_encodings(request)
+    encoding = next((e for e in ENCODINGS if e in variants and e in accepted), 'identity')
+    response = HttpResponse(variants[encoding], content_type=content_type)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Content-Length'] = len(variants[encoding])
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def cached_page_response(request, template_name, get_context, name=None, content_type=None):
+    """
+    Render ``template_name`` once per content version, compress it once per
+    encoding and serve the stored bytes afterwards. ``get_context`` is only
+    called on a miss, so warm hits never touch the ORM or the template engine.
+    """
+    key = _page_key(request, name or template_name)
+    variants = cache.get(key)
+    if variants is None:
+        variants = _render_variants(request, template_name, get_context())
+        cache.set(key, variants, PAGE_TIMEOUT)
+    else:
+        _count('hits')
+    return _page_response(request, variants, content_type)
+
+
+def cached_body_response(request, name, get_body, content_type=None):
+    """
+    cached_page_response for views that produce their own bytes, e.g. by
+    rendering a TemplateResponse. ``get_body`` is only called on a miss.
+    """
+    key = _page_key(request, name)
+    variants = cache.get(key)
+    if variants is None:
+        _count('misses')
+        variants = _compress(get_body())
+        cache.set(key, variants, PAGE_TIMEOUT)
+    else:
+        _count('hits')
+    return _page_response(request, variants, content_type)
+
+
+async def acached_page_response(request, template_name, aget_context, name=None, content_type=None):
+    """Async twin of cached_page_response for a coroutine ``aget_context``."""
+    key = _page_key(request, name or template_name)
+    variants = await cache.aget(key)
+    if variants is None:
+        variants = _render_variants(request, template_name, await aget_context())
+        await cache.aset(key, variants, PAGE_TIMEOUT)
+    else:
+        _count('hits')
+    return _page_response(request, variants, content_type)
+
@@ -0,0 +1,91 @@
+import asyncio
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from .models import *
+
+# Context keys holding a single (active) row rather than a list.
+# Each is also a SiteConfiguration field pointing to the active row.
+SINGLE_SECTIONS = ('metadata', 'hero', 'about', 'process', 'get_in_touch', 'sections')
+
+SITE_CONFIGURATION_KEY = 'core:site-configuration'
+
+
+def _site_configuration():
+    return SiteConfiguration.objects.filter(pk=SITE_CONFIGURATION_PK).values(*SINGLE_SECTIONS)
+
+
+def active_pks():
+    """Primary key of the active row of each single section, cached until the next publish."""
+    pks = cache.get(SITE_CONFIGURATION_KEY)
+    if pks is None:
+        pks = _site_configuration().first() or {}
+        cache.set(SITE_CONFIGURATION_KEY, pks, None)
+    return pks
+
+
+async def aactive_pks():
+    pks = await cache.aget(SITE_CONFIGURATION_KEY)
+    if pks is None:
+        pks = await _site_configuration().afirst() or {}
+        await cache.aset(SITE_CONFIGURATION_KEY, pks, None)
+    return pks
+
+
+def forget_site_configuration():
+    cache.delete(SITE_CONFIGURATION_KEY)
+
+
+def blog_cards():
+    """Active posts without their bodies; cards render the stored excerpt."""
+    return BlogPost.objects.filter(is_active=True).defer('content', 'content_html')
+
+
+def index_querysets(pks):
+    """
+    Homepage querysets. Single sections are fetched by the primary keys from
+    active_pks(). Child rows are prefetched so the query count is constant.
+    """
+    active_skills = Skill.objects.filter(is_active=True)
+    return {
+        'metadata': MetaData.objects.filter(pk=pks.get('metadata')),
+        'hero': Hero.objects.filter(pk=pks.get('hero')),
+        'about': About.objects.filter(pk=pks.get('about')),
+        'process': Process.objects.filter(pk=pks.get('process')).prefetch_related(
+            Prefetch('steps', queryset=Step.objects.filter(is_active=True).order_by('pk'), to_attr='active_steps'),
+        ),
+        'skillgroups': SlkillGroup.objects.filter(is_active=True).prefetch_related(
+            Prefetch('skill_set', queryset=active_skills.order_by('pk'), to_attr='active_skills'),
+        ),
+        'projects': Project.objects.filter(is_active=True).prefetch_related(
+            Prefetch('skill', queryset=active_skills, to_attr='active_skills'),
+        ),
+        'blog_posts': blog_cards(),
+        'achievements': Achievement.objects.filter(is_active=True).defer('description', 'description_html'),
+        'get_in_touch': GetInTouch.objects.filter(pk=pks.get('get_in_touch')).prefetch_related(
+            Prefetch('info_items', queryset=InfoItem.objects.filter(is_active=True).order_by('pk'), to_attr='active_info_items'),
+            Prefetch('social_links', queryset=SocialLink.objects.filter(is_active=True).order_by('pk'), to_attr='active_social_links'),
+        ),
+        'sections': Sections.objects.filter(pk=pks.get('sections')),
+    }
+
+
+def get_index_context():
+    context = index_querysets(active_pks())
+    for key in SINGLE_SECTIONS:
+        context[key] = context[key].first()
+    return context
+
+
+async def _aload(key, queryset):
+    if key in SINGLE_SECTIONS:
+        return await queryset.afirst()
+    return [obj async for obj in queryset]
+
+
+async def aget_index_context():
+    """Async twin of get_index_context; independent sections load concurrently."""
+    querysets = index_querysets(await aactive_pks())
+    values = await asyncio.gather(*(_aload(key, queryset) for key, queryset in querysets.items()))
+    return dict(zip(querysets, values))
@@ -0,0 +1,118 @@
+import re
+
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.template.loader import get_template
+
+CRITICAL_KEY_PREFIX = 'core:critical-css'
+
+CLASS_ATTRIBUTE = re.compile(r'class\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+ID_ATTRIBUTE = re.compile(r'id\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+TEMPLATE_SYNTAX = re.compile(r'{[{%#].*?[}%#]}', re.DOTALL)
+CLASS_SELECTOR = re.compile(r'\.((?:\\.|[\w-])+)')
+ID_SELECTOR = re.compile(r'#((?:\\.|[\w-])+)')
+ESCAPE = re.compile(r'\\(.)')
+KEYFRAMES_NAME = re.compile(r'@(?:-\w+-)?keyframes\s+([\w-]+)')
+# At-rules whose body is a list of rules to filter in turn.
+NESTED_AT_RULES = ('@media', '@supports', '@layer')
+
+
+def used_names(template_names):
+    """Class names and ids in the source of ``template_names``, like Tailwind's own scan."""
+    classes, ids = set(), set()
+    for name in template_names:
+        source = TEMPLATE_SYNTAX.sub(' ', get_template(name).template.source)
+        for match in CLASS_ATTRIBUTE.finditer(source):
+            classes.update(match.group(1).split())
+        for match in ID_ATTRIBUTE.finditer(source):
+            ids.update(match.group(1).split())
+    return classes, ids
+
+
+def _rules(css):
+    """Top-level ``(prelude, body)`` pairs of a stylesheet; ``body`` is None for statements."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    start = depth = 0
+    prelude = None
+    quote = None
+    for i, char in enumerate(css):
+        if quote:
+            if char == quote and css[i - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            if depth == 0:
+                prelude, start = css[start:i].strip(), i + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                yield prelude, css[start:i]
+                start = i + 1
+        elif char == ';' and depth == 0:
+            yield css[start:i].strip(), None
+            start = i + 1
+
+
+def _unescape(name):
+    return ESCAPE.sub(r'\1', name)
+
+
+def _selector_used(selector, classes, ids):
+    return (
+        all(_unescape(name) in classes for name in CLASS_SELECTOR.findall(selector))
+        and all(_unescape(name) in ids for name in ID_SELECTOR.findall(selector))
+    )
+
+
+def extract(css, classes, ids):
+    """
+    The rules of ``css`` that can match markup using only ``classes`` and
+    ``ids``. Rules without class or id selectors (preflight) are kept.
+    """
+    kept, keyframes = [], []
+    for prelude, body in _rules(css):
+        if body is None:
+            kept.append(prelude + ';')
+        elif prelude.startswith(NESTED_AT_RULES):
+            inner = extract(body, classes, ids)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif KEYFRAMES_NAME.match(prelude):
+            keyframes.append((KEYFRAMES_NAME.match(prelude).group(1), f'{prelude}{{{body}}}'))
+        elif prelude.startswith('@'):
+            kept.append(f'{prelude}{{{body}}}')
+        else:
+            selectors = [s for s in prelude.split(',') if _selector_used(s, classes, ids)]
+            if selectors:
+                kept.append(f'{",".join(selectors)}{{{body}}}')
+    output = ''.join(kept)
+    # Animations are only needed if a kept rule uses them.
+    return output + ''.join(rule for name, rule in keyframes if name in output)
+
+
+def _stylesheet(path):
+    """The collected (hashed) file if there is one, the source file otherwise."""
+    try:
+        stored_name = staticfiles_storage.stored_name(path)
+        with staticfiles_storage.open(stored_name) as f:
+            return stored_name, f.read().decode()
+    except (OSError, ValueError):
+        with open(finders.find(path)) as f:
+            return path, f.read()
+
+
+def critical_css(path, template_names, version=''):
+    """
+    CSS of static file ``path`` needed by ``template_names``, cached per
+    hashed asset name and ``version`` (the template stamp).
+    """
+    stored_name, css = _stylesheet(path)
+    key = f'{CRITICAL_KEY_PREFIX}:{stored_name}:{":".join(template_names)}:{version}'
+    result = cache.get(key)
+    if result is None:
+        result = extract(css, *used_names(template_names))
+        cache.set(key, result, None)
+    return result
@@ -0,0 +1,66 @@
+import os
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.db import connections
+
+
+def pragmas_for(connection):
+    """``DATABASES[alias]['PRAGMAS']``, or SQLITE_PRAGMAS for every SQLite database."""
+    return connection.settings_dict.get('PRAGMAS', settings.SQLITE_PRAGMAS)
+
+
+def apply_pragmas(conn, pragmas):
+    """Run ``PRAGMA name = value`` for each item on a DB-API connection."""
+    for name, value in pragmas.items():
+        conn.execute(f'PRAGMA {name} = {value}').fetchall()
+
+
+def database_path(settings_dict):
+    """File of a SQLite database, also when NAME is a file: URI (OPTIONS uri)."""
+    name = str(settings_dict['NAME'])
+    if name.startswith('file:'):
+        return unquote(urlsplit(name).path)
+    return name
+
+
+def _file_identity(connection):
+    """(device, inode) of the database file, None for in-memory databases."""
+    if connection.is_in_memory_db():
+        return None
+    try:
+        stat = os.stat(database_path(connection.settings_dict))
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def configure_connection(sender, connection, **kwargs):
+    """connection_created receiver: tune every new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    apply_pragmas(connection.connection, pragmas_for(connection))
+    connection.file_identity = _file_identity(connection)
+
+
+def is_healthy(connection):
+    """
+    The SQLite backend reports every connection as usable. A persistent
+    connection is stale when the database file was replaced underneath it
+    (a restored backup, a deploy shipping a new file). A stat() of the file
+    tells without sending a query, so warm requests stay query-free.
+    """
+    return getattr(connection, 'file_identity', None) == _file_identity(connection)
+
+
+def close_unhealthy_connections(**kwargs):
+    """request_started receiver: health check for persistent SQLite connections."""
+    for connection in connections.all(initialized_only=True):
+        if (
+            connection.vendor == 'sqlite'
+            and connection.connection is not None
+            and connection.settings_dict['CONN_HEALTH_CHECKS']
+            and not connection.in_atomic_block
+            and not is_healthy(connection)
+        ):
+            connection.close()
@@ -0,0 +1,11 @@
+from django import forms
+
+from .models import Message
+
+
+class ContactForm(forms.ModelForm):
+    message = forms.CharField(widget=forms.Textarea)
+
+    class Meta:
+        model = Message
+        fields = ('name', 'email', 'message')
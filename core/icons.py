@@ -0,0 +1,45 @@
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .models import IconSymbol, InfoItem, Skill, SocialLink
+from .svg import sprite
+
+# Models whose ``icon`` is drawn from the sprite.
+ICON_MODELS = (Skill, InfoItem, SocialLink)
+# HashedMediaStorage adds the content hash: icons.<hash>.svg
+SPRITE_NAME = 'sprites/icons.svg'
+# Context key of the sprite's storage name, stored in the snapshot.
+SPRITE_CONTEXT_KEY = 'icon_sprite'
+# Snapshot key of the symbol names in that sprite.
+SPRITE_SYMBOLS_KEY = 'icon_symbols'
+
+
+def used_symbols():
+    names = set()
+    for model in ICON_MODELS:
+        names.update(model.objects.exclude(icon_symbol='').values_list('icon_symbol', flat=True))
+    return names
+
+
+def update_sprite(previous_name='', previous_symbols=None):
+    """
+    Return the storage name of the sprite of every icon in use, or '' without
+    icons, and the sorted symbol names in it. Symbol names are hashes of the
+    minified icons, so when they match ``previous_symbols`` the sprite
+    ``previous_name`` is reused without reading any markup. Otherwise the
+    new sprite is written and the previous file deleted. Called when the
+    snapshot is rebuilt, so templates read the name from the context and
+    never build the sprite themselves.
+    """
+    names = sorted(used_symbols())
+    if names == previous_symbols and (not previous_name or default_storage.exists(previous_name)):
+        return previous_name, names
+    name = ''
+    if names:
+        symbols = IconSymbol.objects.filter(name__in=names).order_by('name').values_list('markup', flat=True)
+        name = default_storage.save(SPRITE_NAME, ContentFile(sprite(symbols).encode()))
+    if previous_name and previous_name != name:
+        # Once the snapshot naming the new sprite is committed.
+        transaction.on_commit(lambda: default_storage.delete(previous_name))
+    return name, names
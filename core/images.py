@@ -0,0 +1,138 @@
+import atexit
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+
+from .imaging import render_derivatives
+from .models import About, Project
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVES_DIR = 'derivatives'
+# model -> image field. Derivatives are described in ``<field>_variants``.
+IMAGE_FIELDS = {Project: 'image', About: 'avatar'}
+MAX_WORKERS = 2
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(max_workers=MAX_WORKERS):
+    """
+    Worker processes for Pillow, started on first use. Spawned rather than
+    forked: the web process runs threads (see core.inbox).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def _discard_pool(pool):
+    # A worker died (e.g. killed for memory); start fresh on the next upload.
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+
+
+def derivative_prefix(name):
+    return f'{DERIVATIVES_DIR}/{name}'
+
+
+def derivative_names(variants):
+    names = [name for fmt in ('webp', 'jpeg') for _, name in variants.get(fmt, [])]
+    return names + ([variants['thumb']] if 'thumb' in variants else [])
+
+
+def in_use(name):
+    """Whether any row still holds the upload ``name``; identical uploads share it."""
+    return any(model.objects.filter(**{field: name}).exists() for model, field in IMAGE_FIELDS.items())
+
+
+def delete_derivatives(variants, keep=None):
+    if variants.get('source') and in_use(variants['source']):
+        return
+    keep = set(derivative_names(keep or {}))
+    for name in derivative_names(variants):
+        if name not in keep:
+            default_storage.delete(name)
+
+
+def is_current(image, variants):
+    """Whether ``variants`` were rendered from the file ``image`` holds now."""
+    return bool(image) and variants.get('source') == image.name
+
+
+def store_variants(model, pk, field, variants):
+    """
+    Record finished derivatives with a regular save, so the usual signals
+    publish the new content. Skipped if the image changed in the meantime.
+    """
+    obj = model.objects.filter(pk=pk).first()
+    if obj is None or getattr(obj, field).name != variants['source']:
+        delete_derivatives(variants, keep=getattr(obj, f'{field}_variants', None))
+        return False
+    old = getattr(obj, f'{field}_variants')
+    values = {
+        f'{field}_width': variants['width'],
+        f'{field}_height': variants['height'],
+        f'{field}_color': variants.pop('color'),
+        f'{field}_placeholder': variants.pop('placeholder'),
+        f'{field}_variants': variants,
+    }
+    for name, value in values.items():
+        setattr(obj, name, value)
+    obj.save(update_fields=list(values))
+    delete_derivatives(old, keep=variants)
+    return True
+
+
+def _rendered(pool, model, pk, field, future):
+    # Runs on the pool's management thread once a worker is done.
+    try:
+        store_variants(model, pk, field, future.result())
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        logger.exception('Could not render derivatives of %s %s.', model.__name__, pk)
+    except Exception:
+        logger.exception('Could not render derivatives of %s %s.', model.__name__, pk)
+    finally:
+        close_old_connections()
+
+
+def schedule(model, pk, field, name):
+    pool = get_pool()
+    future = pool.submit(render_derivatives, settings.MEDIA_ROOT, name, derivative_prefix(name))
+    future.add_done_callback(functools.partial(_rendered, pool, model, pk, field))
+
+
+def image_saved(sender, instance, raw=False, **kwargs):
+    """Queue derivatives for a new upload once the row is committed."""
+    field = IMAGE_FIELDS[sender]
+    image, variants = getattr(instance, field), getattr(instance, f'{field}_variants')
+    if raw or is_current(image, variants):
+        return
+    if image:
+        transaction.on_commit(functools.partial(schedule, sender, instance.pk, field, image.name))
+    elif variants:
+        # Image removed: drop the derivatives with it.
+        sender.objects.filter(pk=instance.pk).update(**{
+            f'{field}_variants': {}, f'{field}_width': None, f'{field}_height': None,
+            f'{field}_color': '', f'{field}_placeholder': '',
+        })
+        transaction.on_commit(functools.partial(delete_derivatives, variants))
+
+
+def image_deleted(sender, instance, **kwargs):
+    variants = getattr(instance, f'{IMAGE_FIELDS[sender]}_variants')
+    transaction.on_commit(functools.partial(delete_derivatives, variants))
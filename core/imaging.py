@@ -0,0 +1,89 @@
+"""
+Pillow work for responsive image derivatives. Nothing here imports Django:
+these functions run in worker processes, see core.images.
+"""
+import base64
+import io
+import os
+
+from PIL import Image, ImageOps
+
+WIDTHS = (320, 640, 960, 1280, 1920)
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+THUMB_SIZE = (120, 120)
+# The site is dark; transparent areas are flattened onto its background.
+BACKGROUND = (0, 0, 0)
+# Bounding box of the inline blur-up placeholder.
+PLACEHOLDER_SIZE = (16, 16)
+PALETTE_COLORS = 8
+
+
+def _rgb(image):
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        flat = Image.new('RGB', image.size, BACKGROUND)
+        flat.paste(image, mask=image.getchannel('A'))
+        return flat
+    return image.convert('RGB')
+
+
+def _save(image, root, name, fmt):
+    pil_format, options = FORMATS[fmt]
+    path = os.path.join(root, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    image.save(path + '.tmp', pil_format, **options)
+    os.replace(path + '.tmp', path)
+
+
+def dominant_color(image):
+    """Most common colour of a small palette-reduced copy, as ``#rrggbb``."""
+    small = image.copy()
+    small.thumbnail((64, 64))
+    quantized = small.quantize(colors=PALETTE_COLORS)
+    _, index = max(quantized.getcolors())
+    r, g, b = quantized.getpalette()[index * 3:index * 3 + 3]
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def placeholder(image):
+    """A few hundred bytes of WebP as a data URI, stretched while the real image loads."""
+    small = image.copy()
+    small.thumbnail(PLACEHOLDER_SIZE)
+    buffer = io.BytesIO()
+    small.save(buffer, 'WEBP', quality=40)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def open_rgb(path):
+    with Image.open(path) as original:
+        return _rgb(ImageOps.exif_transpose(original))
+
+
+def render_derivatives(root, source, prefix):
+    """
+    Write every derivative of ``root/source`` under ``root/prefix`` and
+    return their description: the original size, ``[width, name]`` lists per
+    format (narrowest first, never wider than the original), a thumbnail, the
+    dominant colour and a placeholder.
+    """
+    image = open_rgb(os.path.join(root, source))
+    width, height = image.size
+    variants = {
+        'source': source, 'width': width, 'height': height,
+        'color': dominant_color(image), 'placeholder': placeholder(image),
+    }
+    for target in sorted({min(w, width) for w in WIDTHS}):
+        resized = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.Resampling.LANCZOS,
+        )
+        for fmt in FORMATS:
+            name = f'{prefix}/{target}w.{fmt}'
+            _save(resized, root, name, fmt)
+            variants.setdefault(fmt, []).append([target, name])
+    image.thumbnail(THUMB_SIZE, Image.Resampling.LANCZOS)
+    variants['thumb'] = f'{prefix}/thumb.jpeg'
+    _save(image, root, variants['thumb'], 'jpeg')
+    return variants
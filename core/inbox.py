@@ -0,0 +1,115 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.db import close_old_connections
+
+from .models import Message
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+FLUSH_INTERVAL = 1.0
+MAX_PENDING = 1000
+STOP_TIMEOUT = 5.0
+
+# Queued by stop(): the writer thread writes its batch and exits.
+_STOP = object()
+
+
+class MessageWriter:
+    """
+    Buffers contact submissions in memory and writes them to ``Message`` with
+    ``bulk_create`` from a background thread, so a burst of submissions costs
+    a few short SQLite write locks instead of one per request.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, max_pending=MAX_PENDING):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, name, email, message):
+        """Queue a submission. Raises ``queue.Full`` when the buffer is full."""
+        self._ensure_started()
+        self.queue.put_nowait(Message(name=name, email=email, message=message))
+
+    def flush(self):
+        """Write everything queued so far from the calling thread."""
+        batch = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+        self._write(batch)
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """
+        Let the writer thread write the batch it is collecting and exit, then
+        write whatever is still queued. A later submit() starts a new thread.
+        """
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self.queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+        self.flush()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='message-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch):
+        if not batch:
+            return
+        close_old_connections()
+        try:
+            Message.objects.bulk_create(batch, batch_size=self.batch_size)
+        except Exception:
+            logger.exception('Dropped %d contact messages', len(batch))
+        finally:
+            close_old_connections()
+
+
+writer = MessageWriter()
+
+# Don't lose buffered messages on a graceful worker shutdown, including the
+# batch the writer thread is still collecting.
+atexit.register(writer.stop)
@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.content import get_index_context
+from core.db import apply_pragmas
+
+from .benchmark_index import _summary
+
+INSERT_MESSAGE = 'INSERT INTO core_message (name, email, message, created) VALUES (?, ?, ?, ?)'
+
+
+def homepage_queries():
+    """SQL of the uncached homepage, as run against the configured database."""
+    with CaptureQueriesContext(connection) as queries:
+        get_index_context()
+    return [query['sql'] for query in queries.captured_queries]
+
+
+class Setup:
+    """How the benchmark connects: per request or persistent, and which pragmas."""
+
+    def __init__(self, path, persistent, pragmas):
+        self.path, self.persistent, self.pragmas = path, persistent, pragmas
+        self.local = threading.local()
+
+    def connect(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            # Autocommit like Django; 5 s is also the default Django timeout.
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            apply_pragmas(conn, self.pragmas)
+            if self.persistent:
+                self.local.conn = conn
+        return conn
+
+    def release(self, conn):
+        if not self.persistent:
+            conn.close()
+
+
+def run(setup, queries, readers, duration, write_interval):
+    stop = threading.Event()
+    latencies, writes, errors = [], [], []
+
+    def read():
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                conn = setup.connect()
+                for sql in queries:
+                    conn.execute(sql).fetchall()
+                setup.release(conn)
+            except sqlite3.OperationalError:
+                errors.append(1)
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    def write():
+        while not stop.is_set():
+            try:
+                conn = setup.connect()
+                conn.execute('BEGIN IMMEDIATE')
+                conn.execute(INSERT_MESSAGE, ('bench', 'bench@example.com', 'x' * 500, '2026-01-01 00:00:00'))
+                conn.execute('COMMIT')
+                setup.release(conn)
+                writes.append(1)
+            except sqlite3.OperationalError:
+                errors.append(1)
+            stop.wait(write_interval)
+
+    threads = [threading.Thread(target=read) for _ in range(readers)] + [threading.Thread(target=write)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    if not latencies:
+        raise CommandError(f'No homepage read completed in {duration} s ({len(errors)} errors).')
+    result = _summary(latencies, time.perf_counter() - start, len(errors))
+    result['writes'] = len(writes)
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark homepage read throughput on copies of the configured SQLite '
+        'database while a writer inserts contact messages: a new connection per '
+        'request with SQLite defaults, against persistent connections with '
+        'SQLITE_PRAGMAS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, nargs='+', default=[1, 4, 16], help='Reader threads per run.')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per run.')
+        parser.add_argument('--write-interval', type=float, default=0.01, help='Seconds between writes.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('benchmark_db only benchmarks SQLite databases.')
+        queries = homepage_queries()
+        setups = {
+            'before': lambda path: Setup(path, persistent=False, pragmas={'journal_mode': 'delete'}),
+            'after': lambda path: Setup(path, persistent=True, pragmas=settings.SQLITE_PRAGMAS),
+        }
+        self.stdout.write(f'{len(queries)} queries per homepage render.')
+        self.stdout.write(
+            f'{"setup":<8}{"readers":>8}{"reads/s":>10}{"p50 ms":>10}{"p99 ms":>10}{"writes":>8}{"errors":>8}'
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            for readers in options['readers']:
+                for name, make_setup in setups.items():
+                    # A fresh copy per run: journal_mode is stored in the file.
+                    path = os.path.join(tmp, f'{name}-{readers}.sqlite3')
+                    self.copy_database(path)
+                    result = run(make_setup(path), queries, readers, options['duration'], options['write_interval'])
+                    self.stdout.write(
+                        f'{name:<8}{readers:>8}{result["rps"]:>10.0f}{result["p50_ms"]:>10.2f}'
+                        f'{result["p99_ms"]:>10.2f}{result["writes"]:>8}{result["errors"]:>8}'
+                    )
+
+    def copy_database(self, path):
+        # The backup API gives a consistent copy even while the site is writing.
+        target = sqlite3.connect(path)
+        with target:
+            connection.ensure_connection()
+            connection.connection.backup(target)
+        target.close()
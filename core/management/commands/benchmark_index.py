@@ -0,0 +1,134 @@
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+HOST = 'localhost'
+
+
+def _summary(latencies, elapsed, errors):
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def run_wsgi(concurrency, total):
+    from django.core.wsgi import get_wsgi_application
+    app = get_wsgi_application()
+
+    def request():
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': '/', 'QUERY_STRING': '',
+            'SERVER_NAME': HOST, 'SERVER_PORT': '80', 'HTTP_HOST': HOST,
+            'HTTP_ACCEPT_ENCODING': 'gzip, br', 'REMOTE_ADDR': '127.0.0.1',
+            'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+        }
+        status = []
+        start = time.perf_counter()
+        body = b''.join(app(environ, lambda s, h: status.append(s)))
+        return time.perf_counter() - start, status[0].startswith('200') and bool(body)
+
+    request()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: request(), range(total)))
+    elapsed = time.perf_counter() - start
+    return _summary([t for t, _ in results], elapsed, sum(not ok for _, ok in results))
+
+
+def run_asgi(concurrency, total):
+    from django.core.asgi import get_asgi_application
+    app = get_asgi_application()
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': '/', 'raw_path': b'/', 'root_path': '',
+        'query_string': b'', 'server': (HOST, 80), 'client': ('127.0.0.1', 50000),
+        'headers': [(b'host', HOST.encode()), (b'accept-encoding', b'gzip, br')],
+    }
+
+    async def request():
+        status = []
+        pending = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            if pending:
+                return pending.pop()
+            # The client never disconnects; Django cancels this once it has responded.
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+
+        start = time.perf_counter()
+        await app(dict(scope), receive, send)
+        return time.perf_counter() - start, status == [200]
+
+    async def main():
+        await request()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited():
+            async with semaphore:
+                return await request()
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(limited() for _ in range(total)))
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(main())
+    return _summary([t for t, _ in results], elapsed, sum(not ok for _, ok in results))
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the homepage through the WSGI handler (sync index, thread '
+        'pool) and the ASGI handler (async index, event loop) at several '
+        'concurrency levels. Runs in-process against the configured database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 1000])
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per run.')
+        parser.add_argument('--mode', choices=['wsgi', 'asgi'], help='Run a single mode and print JSON.')
+
+    def handle(self, *args, **options):
+        if options['mode']:
+            # Child process: one mode, one concurrency level.
+            runner = run_asgi if options['mode'] == 'asgi' else run_wsgi
+            result = runner(options['concurrency'][0], options['requests'])
+            self.stdout.write(json.dumps(result))
+            return
+
+        self.stdout.write(f'{"mode":<6}{"conc":>6}{"req/s":>10}{"p50 ms":>10}{"p99 ms":>10}{"errors":>8}')
+        for concurrency in options['concurrency']:
+            for mode in ('wsgi', 'asgi'):
+                result = self.run_child(mode, concurrency, options['requests'])
+                self.stdout.write(
+                    f'{mode:<6}{concurrency:>6}{result["rps"]:>10.0f}{result["p50_ms"]:>10.1f}'
+                    f'{result["p99_ms"]:>10.1f}{result["errors"]:>8}'
+                )
+
+    def run_child(self, mode, concurrency, total):
+        # A fresh process per run: ASYNC_INDEX decides which view the
+        # URLconf routes to, just like in a real deployment.
+        env = dict(os.environ, ASYNC_INDEX='True' if mode == 'asgi' else 'False')
+        command = [
+            sys.executable, sys.argv[0], 'benchmark_index', '--mode', mode,
+            '--concurrency', str(concurrency), '--requests', str(total),
+        ]
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+        if completed.returncode:
+            raise CommandError(completed.stderr)
+        return json.loads(completed.stdout.strip().splitlines()[-1])
@@ -0,0 +1,70 @@
+import os
+import re
+import shlex
+import subprocess
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+
+from core.signals import CONTENT_MODELS
+
+CLASS_ATTRIBUTE = re.compile(r'class\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+# Listed in tailwind.config.js content, next to the templates.
+DB_CLASSES_PATH = os.path.join(settings.BASE_DIR, 'cache', 'tailwind', 'db-classes.html')
+INPUT_CSS = os.path.join(settings.BASE_DIR, 'statics', 'input.css')
+OUTPUT_CSS = os.path.join(settings.BASE_DIR, 'statics', 'style.css')
+# Installed from package.json by `npm install`.
+TAILWIND = os.path.join(settings.BASE_DIR, 'node_modules', '.bin', 'tailwindcss')
+
+
+def db_class_names():
+    """Class names in admin-entered HTML (SVG icons, post bodies) that templates render with |safe."""
+    names = set()
+    for model in CONTENT_MODELS:
+        fields = [f.attname for f in model._meta.concrete_fields if isinstance(f, (models.CharField, models.TextField))]
+        if not fields:
+            continue
+        for values in model.objects.values_list(*fields):
+            for value in values:
+                for match in CLASS_ATTRIBUTE.finditer(value or ''):
+                    names.update(match.group(1).split())
+    return sorted(names)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compile and purge Tailwind against the templates, script.js and the class '
+        'names stored in the database, then collect static files under '
+        'content-hashed names (ManifestStaticFilesStorage).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tailwind', default=shlex.quote(TAILWIND), help='Tailwind CLI command.')
+        parser.add_argument('--skip-css', action='store_true', help='Only collect static files.')
+
+    def handle(self, *args, **options):
+        if not options['skip_css']:
+            self.write_db_classes()
+            self.compile_css(shlex.split(options['tailwind']))
+        call_command('collectstatic', interactive=False, verbosity=options['verbosity'])
+        self.stdout.write(self.style.SUCCESS(f'Collected static files into {settings.STATIC_ROOT}.'))
+
+    def write_db_classes(self):
+        names = db_class_names()
+        os.makedirs(os.path.dirname(DB_CLASSES_PATH), exist_ok=True)
+        with open(DB_CLASSES_PATH, 'w') as f:
+            f.write(f'<div class="{" ".join(names)}"></div>\n')
+        self.stdout.write(f'{len(names)} class names from the database.')
+
+    def compile_css(self, tailwind):
+        command = tailwind + [
+            '--config', os.path.join(settings.BASE_DIR, 'tailwind.config.js'),
+            '--input', INPUT_CSS, '--output', OUTPUT_CSS, '--minify',
+        ]
+        try:
+            subprocess.run(command, cwd=settings.BASE_DIR, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise CommandError(f'Tailwind failed ({e}). Run `npm install` first or pass --tailwind.')
+        self.stdout.write(f'Compiled {os.path.relpath(OUTPUT_CSS, settings.BASE_DIR)} ({os.path.getsize(OUTPUT_CSS)} bytes).')
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import re
+from html import unescape
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+from core import views
+from core.content import blog_cards
+from core.models import BlogPost
+from core.sitemaps import SITEMAPS, needs_index
+from core.snapshot import load_index_context
+
+MANIFEST_NAME = '.export-manifest.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Prerender the homepage, the blog, robots.txt and sitemap.xml plus the '
+        'static and media files they reference into DIR. Only files whose content '
+        'changed since the last export are rewritten. The contact form posts to '
+        '/contact/, which must still reach Django; it needs no CSRF token or cookie.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory')
+        parser.add_argument(
+            '--base-url', default='http://localhost',
+            help='Public URL of the site, used for absolute links (host must be in ALLOWED_HOSTS).',
+        )
+
+    def handle(self, *args, **options):
+        self.root = os.path.abspath(options['directory'])
+        os.makedirs(self.root, exist_ok=True)
+        self.old_manifest = self.read_manifest()
+        self.manifest = {}
+        self.written = 0
+
+        self.base_url = urlsplit(options['base_url'])
+        if not self.base_url.netloc:
+            raise CommandError(f'--base-url must be absolute, got {options["base_url"]!r}.')
+        pages = dict(self.render_pages())
+        urls = set()
+        for path, content in pages.items():
+            self.export_bytes(path, content)
+            if path.endswith('.html'):
+                urls.update(self.asset_urls(content.decode()))
+        for url in sorted(urls):
+            self.export_asset(url)
+
+        removed = self.remove_stale()
+        self.write_manifest()
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {len(self.manifest)} files to {self.root}: '
+            f'{self.written} written, {len(self.manifest) - self.written} unchanged, {removed} removed.'
+        ))
+
+    def build_request(self, path='/'):
+        return RequestFactory().get(path, HTTP_HOST=self.base_url.netloc, secure=self.base_url.scheme == 'https')
+
+    def render(self, template_name, context, path):
+        return render_to_string(template_name, context, request=self.build_request(path)).encode()
+
+    def render_pages(self):
+        request = self.build_request()
+        context = load_index_context()
+        yield 'index.html', self.render('index.html', context, '/')
+        # Every page linked from the homepage and listed in the sitemap. A
+        # static host ignores ?after= cursors, so the list holds every post.
+        posts = list(blog_cards().order_by('-created', '-pk'))
+        yield 'blog/index.html', self.render('blog_list.html', {**context, 'blog_posts': posts}, '/blog/')
+        for post in BlogPost.objects.filter(is_active=True).defer('content'):
+            url = post.get_absolute_url()
+            yield f'{url.strip("/")}/index.html', self.render('blog_detail.html', {**context, 'post': post}, url)
+        yield 'robots.txt', views.robots(request).content
+        yield 'sitemap.xml', views.sitemap(request).content
+        if needs_index():
+            for section in SITEMAPS:
+                yield f'sitemap-{section}.xml', views.sitemap_section(request, section).content
+
+    def asset_urls(self, html):
+        """Static and media paths in src/href attributes, url() and every srcset candidate."""
+        prefixes = (settings.STATIC_URL, settings.MEDIA_URL)
+        urls = []
+        for prefix in prefixes:
+            pattern = r'["\'(](%s[^"\')\s]+)' % re.escape(prefix)
+            urls += [match.group(1) for match in re.finditer(pattern, html)]
+        # "url 320w, url 640w, ...": the pattern above only sees the first URL.
+        for match in re.finditer(r'\b(?:image)?srcset\s*=\s*(["\'])(.*?)\1', html, re.S | re.I):
+            for candidate in unescape(match.group(2)).split(','):
+                parts = candidate.split()
+                if parts and parts[0].startswith(prefixes):
+                    urls.append(parts[0])
+        for url in urls:
+            yield unquote(urlsplit(url).path)
+
+    def find_source(self, url):
+        if url.startswith(settings.STATIC_URL):
+            name = url[len(settings.STATIC_URL):]
+            return finders.find(name) or self.safe_join(settings.STATIC_ROOT, name)
+        return self.safe_join(settings.MEDIA_ROOT, url[len(settings.MEDIA_URL):])
+
+    def safe_join(self, base, name):
+        path = os.path.abspath(os.path.join(base, name))
+        if not path.startswith(os.path.abspath(base) + os.sep) or not os.path.isfile(path):
+            return None
+        return path
+
+    def export_asset(self, url):
+        source = self.find_source(url)
+        if source is None:
+            self.stderr.write(f'Skipping {url}: file not found.')
+            return
+        path = url.lstrip('/')
+        stat = os.stat(source)
+        previous = self.old_manifest.get(path)
+        # Unchanged source: skip hashing the file again.
+        if previous and previous.get('source') == [stat.st_size, stat.st_mtime_ns] and self.exists(path):
+            self.manifest[path] = previous
+            return
+        with open(source, 'rb') as f:
+            self.export_bytes(path, f.read(), source=[stat.st_size, stat.st_mtime_ns])
+
+    def export_bytes(self, path, content, source=None):
+        digest = hashlib.sha256(content).hexdigest()
+        entry = {'sha256': digest}
+        if source is not None:
+            entry['source'] = source
+        self.manifest[path] = entry
+        previous = self.old_manifest.get(path)
+        if previous and previous['sha256'] == digest and self.exists(path):
+            return
+        target = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = f'{target}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, target)
+        self.written += 1
+
+    def exists(self, path):
+        return os.path.isfile(os.path.join(self.root, path))
+
+    def remove_stale(self):
+        removed = 0
+        for path in set(self.old_manifest) - set(self.manifest):
+            try:
+                os.remove(os.path.join(self.root, path))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def read_manifest(self):
+        try:
+            with open(os.path.join(self.root, MANIFEST_NAME)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def write_manifest(self):
+        with open(os.path.join(self.root, MANIFEST_NAME), 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
@@ -0,0 +1,53 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.imaging import render_derivatives
+from core.images import IMAGE_FIELDS, derivative_prefix, is_current, store_variants
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the responsive derivatives of every uploaded Project.image and '
+        'About.avatar in parallel. Images whose derivatives are current are skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--force', action='store_true', help='Re-render current derivatives too.')
+
+    def handle(self, *args, **options):
+        jobs = []
+        for model, field in IMAGE_FIELDS.items():
+            for obj in model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True}).only('pk', field, f'{field}_variants'):
+                image = getattr(obj, field)
+                if options['force'] or not is_current(image, getattr(obj, f'{field}_variants')):
+                    jobs.append((model, obj.pk, field, image.name))
+
+        start = time.perf_counter()
+        rendered = []
+        failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {
+                pool.submit(render_derivatives, settings.MEDIA_ROOT, name, derivative_prefix(name)): (model, pk, field, name)
+                for model, pk, field, name in jobs
+            }
+            for future in as_completed(futures):
+                model, pk, field, name = futures[future]
+                try:
+                    rendered.append((model, pk, field, future.result()))
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f'{model.__name__} {pk} ({name}): {e}')
+
+        # One transaction, so the content is published once.
+        with transaction.atomic():
+            for model, pk, field, variants in rendered:
+                store_variants(model, pk, field, variants)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rendered {len(rendered)} of {len(jobs)} images in {time.perf_counter() - start:.1f}s, {failed} failed.'
+        ))
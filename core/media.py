@@ -0,0 +1,117 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from .storage import HASH_LENGTH
+
+# Names written by HashedMediaStorage or ManifestStaticFilesStorage, or
+# derivatives of one (core.images).
+HASHED_NAME = re.compile(r'\.[0-9a-f]{%d}\.[^/]+(/|$)' % HASH_LENGTH)
+IMMUTABLE = 'public, max-age=31536000, immutable'
+MUTABLE = 'public, max-age=3600'
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def _etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _byte_range(request, size, etag):
+    """
+    (start, end) of a single satisfiable ``Range``, None to send the whole
+    file, or False when the range cannot be satisfied. Multiple ranges and
+    stale If-Range validators get the whole file, which RFC 9110 allows.
+    """
+    header = request.headers.get('Range')
+    if not header or request.headers.get('If-Range', etag) != etag:
+        return None
+    match = RANGE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last) if last else size - 1, size - 1)
+    else:
+        start, end = max(0, size - int(last)), size - 1
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _offloaded(path, name):
+    """Let the front server send the bytes (and handle Range) itself."""
+    response = HttpResponse()
+    if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+        response.headers['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + name
+    else:
+        response.headers['X-Sendfile'] = path
+    # The front server fills in the real type from the file.
+    del response.headers['Content-Type']
+    return response
+
+
+def _streamed(request, path, stat, etag):
+    byte_range = _byte_range(request, stat.st_size, etag)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response.headers['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if byte_range is None:
+        # FileResponse lets the WSGI server use sendfile() when it can.
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(path, start, end - start + 1), status=206, content_type=content_type)
+        response.headers['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        response.headers['Content-Length'] = end - start + 1
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
+
+
+@require_safe
+def serve(request, path, document_root=None, offload=True):
+    """
+    Uploaded media in production. Content-hashed names are cached forever;
+    conditional and Range requests are answered here, and the transfer is
+    handed to the front server when MEDIA_SENDFILE is set. Also serves
+    collected static files when no front server does.
+    """
+    try:
+        full_path = safe_join(document_root or settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (OSError, ValueError):
+        raise Http404('No such file.')
+    if not os.path.isfile(full_path):
+        raise Http404('No such file.')
+
+    etag = _etag(stat)
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        if offload and settings.MEDIA_SENDFILE:
+            response = _offloaded(full_path, path)
+        else:
+            response = _streamed(request, full_path, stat, etag)
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(stat.st_mtime)
+    response.headers['Cache-Control'] = IMMUTABLE if HASHED_NAME.search(path) else MUTABLE
+    return response
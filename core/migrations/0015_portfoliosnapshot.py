@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-18 05:44
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_achievement_blogpost_hero_resume_url_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+from django.utils import timezone
+from django.utils.text import slugify
+
+
+def fill_slugs(apps, schema_editor):
+    BlogPost = apps.get_model('core', 'BlogPost')
+    used = set()
+    for post in BlogPost.objects.order_by('created', 'pk').only('pk', 'title'):
+        base = slugify(post.title)[:245] or 'blogpost'
+        slug, n = base, 1
+        while slug in used:
+            n += 1
+            slug = f'{base}-{n}'
+        used.add(slug)
+        BlogPost.objects.filter(pk=post.pk).update(slug=slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_portfoliosnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, default=timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='blogpost',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=255, unique=True),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.3 on 2026-10-18 05:54
+
+from django.db import migrations, models
+
+from core.sanitize import summarize_html
+
+BATCH_SIZE = 500
+
+
+def backfill(model, source, fields):
+    last_pk = 0
+    while True:
+        batch = list(model.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', source)[:BATCH_SIZE])
+        if not batch:
+            return
+        for obj in batch:
+            values = summarize_html(getattr(obj, source))
+            for field, value in zip(fields, values):
+                setattr(obj, field, value)
+        model.objects.bulk_update(batch, fields)
+        last_pk = batch[-1].pk
+
+
+def fill_derived_fields(apps, schema_editor):
+    backfill(apps.get_model('core', 'BlogPost'), 'content',
+             ['content_html', 'excerpt', 'word_count', 'reading_time'])
+    backfill(apps.get_model('core', 'Achievement'), 'description',
+             ['description_html', 'excerpt', 'word_count', 'reading_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_blogpost_slug_updated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='achievement',
+            name='description_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='achievement',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='achievement',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='achievement',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_derived_fields, migrations.RunPython.noop),
+    ]
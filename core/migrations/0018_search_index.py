@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from core.search import SCHEMA, TABLE, rebuild_index
+
+
+def fill_search_index(apps, schema_editor):
+    rebuild_index(apps, using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_blogpost_achievement_derived_fields'),
+    ]
+
+    operations = [
+        migrations.RunSQL(SCHEMA, f'DROP TABLE IF EXISTS {TABLE}'),
+        migrations.RunPython(fill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:13
+
+import os
+
+from django.conf import settings
+from django.db import migrations, models
+
+from core.imaging import dominant_color, open_rgb, placeholder
+
+
+def measure_images(apps, schema_editor):
+    for model_name, field in (('Project', 'image'), ('About', 'avatar')):
+        model = apps.get_model('core', model_name)
+        for obj in model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True}):
+            try:
+                image = open_rgb(os.path.join(settings.MEDIA_ROOT, getattr(obj, field).name))
+            except OSError:
+                # Missing or unreadable upload; measured on the next upload.
+                continue
+            model.objects.filter(pk=obj.pk).update(**{
+                f'{field}_width': image.width,
+                f'{field}_height': image.height,
+                f'{field}_color': dominant_color(image),
+                f'{field}_placeholder': placeholder(image),
+            })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='about',
+            name='avatar_color',
+            field=models.CharField(blank=True, editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name='about',
+            name='avatar_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='about',
+            name='avatar_placeholder',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='about',
+            name='avatar_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_color',
+            field=models.CharField(blank=True, editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(measure_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:21
+
+from django.db import migrations, models
+
+from core.svg import minify_svg
+
+
+def minify_icons(apps, schema_editor):
+    IconSymbol = apps.get_model('core', 'IconSymbol')
+    for model_name in ('Skill', 'InfoItem', 'SocialLink'):
+        model = apps.get_model('core', model_name)
+        for obj in model.objects.exclude(icon__isnull=True).exclude(icon='').only('icon'):
+            minified = minify_svg(obj.icon)
+            if minified:
+                name, markup = minified
+                IconSymbol.objects.get_or_create(name=name, defaults={'markup': markup})
+                model.objects.filter(pk=obj.pk).update(icon_symbol=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_image_dimensions_placeholders'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IconSymbol',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=16, unique=True)),
+                ('markup', models.TextField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='infoitem',
+            name='icon_symbol',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='icon_symbol',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='sociallink',
+            name='icon_symbol',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.RunPython(minify_icons, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_icon_sprite'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='about',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='about_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='achievement',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-award_date', '-id'], name='achievement_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='achievement',
+            index=models.Index(fields=['-award_date', '-id'], name='achievement_award_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created', '-id'], name='blogpost_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['updated'], name='blogpost_active_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['-created', '-id'], name='blogpost_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['author'], name='blogpost_author_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='getintouch',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='getintouch_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hero',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='hero_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='infoitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='infoitem_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='metadata',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='metadata_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='process_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['ordering_index', '-created'], name='project_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['ordering_index', '-id'], name='project_ordering_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='skill_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='slkillgroup',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='skillgroup_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sociallink',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='sociallink_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='step',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='step_active_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# SiteConfiguration field -> model; Sections has no is_active.
+SINGLE_SECTIONS = {
+    'metadata': 'MetaData',
+    'hero': 'Hero',
+    'about': 'About',
+    'process': 'Process',
+    'get_in_touch': 'GetInTouch',
+    'sections': 'Sections',
+}
+
+
+def point_to_active_rows(apps, schema_editor):
+    # The homepage showed the first active row; keep it and deactivate the
+    # others so the single-active constraints can be added.
+    pointers = {}
+    for field, model_name in SINGLE_SECTIONS.items():
+        model = apps.get_model('core', model_name)
+        rows = model.objects.order_by('pk')
+        if field != 'sections':
+            rows = rows.filter(is_active=True)
+        pointers[field] = rows.first()
+        if field != 'sections' and pointers[field] is not None:
+            rows.exclude(pk=pointers[field].pk).update(is_active=False)
+    apps.get_model('core', 'SiteConfiguration').objects.create(pk=1, **pointers)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_active_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteConfiguration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metadata', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.metadata')),
+                ('hero', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.hero')),
+                ('about', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.about')),
+                ('process', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.process')),
+                ('get_in_touch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.getintouch')),
+                ('sections', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.sections')),
+            ],
+            options={
+                'verbose_name': 'Site configuration',
+                'verbose_name_plural': 'Site configuration',
+            },
+        ),
+        migrations.RunPython(point_to_active_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='about',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='about_single_active'),
+        ),
+        migrations.AddConstraint(
+            model_name='getintouch',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='getintouch_single_active'),
+        ),
+        migrations.AddConstraint(
+            model_name='hero',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='hero_single_active'),
+        ),
+        migrations.AddConstraint(
+            model_name='metadata',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='metadata_single_active'),
+        ),
+        migrations.AddConstraint(
+            model_name='process',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='process_single_active'),
+        ),
+    ]
@@ -1,16 +1,98 @@
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.urls import reverse
+from django.utils.text import slugify
 
-class MetaData(models.Model):
+from .sanitize import summarize_html
+from .svg import minify_svg
+
+
+def unique_slug(model, text, exclude_pk=None, max_length=255):
+    '''slugify text, adding -2, -3, ... until no other row uses it'''
+    base = slugify(text)[:max_length - 10] or model._meta.model_name
+    slug, n = base, 1
+    others = model.objects.exclude(pk=exclude_pk)
+    while others.filter(slug=slug).exists():
+        n += 1
+        slug = f'{base}-{n}'
+    return slug
+
+def icon_symbol(obj):
+    '''store obj.icon as a sprite symbol; returns its name, or '' to inline the icon as is'''
+    minified = minify_svg(obj.icon)
+    name = ''
+    if minified:
+        name, markup = minified
+        IconSymbol.objects.get_or_create(name=name, defaults={'markup': markup})
+    return name
+
+# Every public query filters on is_active; partial indexes hold only those rows.
+ACTIVE = models.Q(is_active=True)
+
+def active_index(name, *fields):
+    '''partial index over the active rows, in the order the site reads them'''
+    return models.Index(fields=list(fields or ['id']), condition=ACTIVE, name=name)
+
+def single_active(name):
+    '''partial unique constraint: at most one active row in the table'''
+    return models.UniqueConstraint(fields=['is_active'], condition=ACTIVE, name=name)
+
+def _is_single_active(constraint):
+    return isinstance(constraint, models.UniqueConstraint) and constraint.fields == ('is_active',) and constraint.condition == ACTIVE
+
+SITE_CONFIGURATION_PK = 1
+
+class ActiveSingleton:
+    '''
+    Model mixin for sections with one active row, which SiteConfiguration
+    points to. Activating a row deactivates the previous one by primary key
+    instead of updating the whole table. Models without is_active (Sections)
+    only claim the pointer while it is empty.
+    '''
+    # Field of SiteConfiguration pointing to the active row
+    site_field = None
+
+    def get_constraints(self):
+        # Forms validate constraints before save(), which is what deactivates
+        # the previous row; the single-active constraint would reject every
+        # switch. The database still enforces it.
+        return [
+            (model, [c for c in constraints if not _is_single_active(c)])
+            for model, constraints in super().get_constraints()
+        ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            config, _ = SiteConfiguration.objects.get_or_create(pk=SITE_CONFIGURATION_PK)
+            current = getattr(config, f'{self.site_field}_id')
+            active = getattr(self, 'is_active', current in (None, self.pk))
+            if active and current != self.pk and hasattr(self, 'is_active'):
+                # Without a pointer the partial unique index finds the active row, if any.
+                previous = models.Q(pk=current) if current is not None else ACTIVE
+                type(self).objects.filter(previous).exclude(pk=self.pk).update(is_active=False)
+            super().save(*args, **kwargs)
+            pointer = self.pk if active else (None if current == self.pk else current)
+            if pointer != current:
+                setattr(config, f'{self.site_field}_id', pointer)
+                config.save(update_fields=[self.site_field])
+
+class MetaData(ActiveSingleton, models.Model):
+    site_field = 'metadata'
     title = models.CharField(max_length=255, null=True, blank=True)
     description = models.TextField(null=True, blank=True)
     keywords = models.TextField(null=True, blank=True)
     logo_charecter = models.TextField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     
+    class Meta:
+        indexes = [active_index('metadata_active_idx')]
+        constraints = [single_active('metadata_single_active')]
+
     def __str__(self):
         return f'{self.title}'
 
-class Hero(models.Model):
+class Hero(ActiveSingleton, models.Model):
+    site_field = 'hero'
     greeting = models.CharField(max_length=255, default="Hello I'm", null=True, blank=True)
     full_name = models.CharField(max_length=255, null=True, blank=True)
     title = models.CharField(max_length=255, null=True, blank=True)
@@ -19,23 +101,30 @@ class Hero(models.Model):
     resume_url = models.URLField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
 
-    def save(self, *args, **kwargs):
-        if self.is_active:
-            Hero.objects.exclude(pk=self.pk).update(is_active=False)
-        super(Hero, self).save(*args, **kwargs)
+    class Meta:
+        indexes = [active_index('hero_active_idx')]
+        constraints = [single_active('hero_single_active')]
+
 
     def __str__(self):
         return f'{self.greeting} {self.full_name} {self.title}'
     
-class About(models.Model):
+class About(ActiveSingleton, models.Model):
+    site_field = 'about'
     about = models.TextField(null=True, blank=True)
     avatar = models.ImageField(null=True, blank=True)
+    # Measured when avatar is uploaded, see core.images
+    avatar_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    avatar_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
+    avatar_color = models.CharField(max_length=7, blank=True, editable=False)
+    avatar_placeholder = models.TextField(blank=True, editable=False)
     is_active = models.BooleanField(default=True)
 
-    def save(self, *args, **kwargs):
-        if self.is_active:
-            About.objects.exclude(pk=self.pk).update(is_active=False)
-        super(About, self).save(*args, **kwargs)
+    class Meta:
+        indexes = [active_index('about_active_idx')]
+        constraints = [single_active('about_single_active')]
+
     
     def __str__(self):
         return f'{self.about[:50]}...'
@@ -44,6 +133,12 @@ class Project(models.Model):
     title = models.CharField(max_length=255, null=True, blank=True)
     description = models.TextField(null=True, blank=True)
     image = models.ImageField(null=True, blank=True)
+    # Measured when image is uploaded, see core.images
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
     demo_url = models.URLField(null=True, blank=True)
     source_url = models.URLField(default='https://github.com/', null=True, blank=True)
     skill = models.ManyToManyField('Skill', blank=True)
@@ -53,6 +148,11 @@ class Project(models.Model):
 
     class Meta:
         ordering = ['ordering_index', '-created']
+        indexes = [
+            active_index('project_active_idx', 'ordering_index', '-created'),
+            # Admin changelist: ordering_index, then -pk
+            models.Index(fields=['ordering_index', '-id'], name='project_ordering_idx'),
+        ]
     
     def __str__(self):
         return f'{self.title}'
@@ -61,22 +161,39 @@ class SlkillGroup(models.Model):
     title = models.CharField(max_length=255, null=True, blank=True)
     is_active = models.BooleanField(default=True)
     
+    class Meta:
+        indexes = [active_index('skillgroup_active_idx')]
+
     def __str__(self):
         return f'{self.title}'
 
 class Skill(models.Model):
     title = models.CharField(max_length=255, null=True, blank=True)
     icon = models.TextField(null=True, blank=True)
+    # Sprite symbol for icon, see core.icons
+    icon_symbol = models.CharField(max_length=16, blank=True, editable=False)
     group = models.ForeignKey(SlkillGroup, on_delete=models.SET_NULL, null=True, blank=True)
     is_active = models.BooleanField(default=True)
     
+    class Meta:
+        indexes = [active_index('skill_active_idx')]
+
+    def save(self, *args, **kwargs):
+        self.icon_symbol = icon_symbol(self)
+        super(Skill, self).save(*args, **kwargs)
+
     def __str__(self):
         return f'{self.title}'
 
-class Process(models.Model):
+class Process(ActiveSingleton, models.Model):
+    site_field = 'process'
     description = models.TextField(max_length=255, null=True, blank=True)
     is_active = models.BooleanField(default=True)
     
+    class Meta:
+        indexes = [active_index('process_active_idx')]
+        constraints = [single_active('process_single_active')]
+
     def __str__(self):
         return f'{self.description[:50]}'
     
@@ -86,14 +203,22 @@ class Step(models.Model):
     process = models.ForeignKey(Process, related_name='steps', on_delete=models.SET_NULL, null=True, blank=True)
     is_active = models.BooleanField(default=True)
     
+    class Meta:
+        indexes = [active_index('step_active_idx')]
+
     def __str__(self):
         return f'{self.title}'
     
-class GetInTouch(models.Model):
+class GetInTouch(ActiveSingleton, models.Model):
+    site_field = 'get_in_touch'
     title = models.CharField(max_length=255, null=True, blank=True)
     description = models.TextField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     
+    class Meta:
+        indexes = [active_index('getintouch_active_idx')]
+        constraints = [single_active('getintouch_single_active')]
+
     def __str__(self):
         return f'{self.title}'
     
@@ -102,9 +227,18 @@ class InfoItem(models.Model):
     value = models.TextField(null=True, blank=True)
     link = models.URLField(null=True, blank=True)
     icon = models.TextField(null=True, blank=True)
+    # Sprite symbol for icon, see core.icons
+    icon_symbol = models.CharField(max_length=16, blank=True, editable=False)
     get_in_touch = models.ForeignKey(GetInTouch, related_name='info_items', on_delete=models.SET_NULL, null=True, blank=True)
     is_active = models.BooleanField(default=True)
     
+    class Meta:
+        indexes = [active_index('infoitem_active_idx')]
+
+    def save(self, *args, **kwargs):
+        self.icon_symbol = icon_symbol(self)
+        super(InfoItem, self).save(*args, **kwargs)
+
     def __str__(self):
         return f'{self.key}'
     
@@ -112,14 +246,24 @@ class SocialLink(models.Model):
     title = models.CharField(max_length=255, null=True, blank=True)
     link = models.URLField(null=True, blank=True)
     icon = models.TextField(null=True, blank=True)
+    # Sprite symbol for icon, see core.icons
+    icon_symbol = models.CharField(max_length=16, blank=True, editable=False)
     get_in_touch = models.ForeignKey(GetInTouch, related_name='social_links', on_delete=models.SET_NULL, null=True, blank=True)
     is_active = models.BooleanField(default=True)
     
+    class Meta:
+        indexes = [active_index('sociallink_active_idx')]
+
+    def save(self, *args, **kwargs):
+        self.icon_symbol = icon_symbol(self)
+        super(SocialLink, self).save(*args, **kwargs)
+
     def __str__(self):
         return f'{self.title}'
     
-class Sections(models.Model):
+class Sections(ActiveSingleton, models.Model):
     '''visible or hide section'''
+    site_field = 'sections'
     about_me = models.BooleanField(default=True)
     projects = models.BooleanField(default=True)
     skills = models.BooleanField(default=True)
@@ -133,6 +277,22 @@ class Sections(models.Model):
         verbose_name = 'Sections'
         verbose_name_plural = 'Sections'
 
+class SiteConfiguration(models.Model):
+    '''the active row of each single-row section; one row, SITE_CONFIGURATION_PK'''
+    metadata = models.ForeignKey(MetaData, related_name='+', on_delete=models.SET_NULL, null=True, blank=True)
+    hero = models.ForeignKey(Hero, related_name='+', on_delete=models.SET_NULL, null=True, blank=True)
+    about = models.ForeignKey(About, related_name='+', on_delete=models.SET_NULL, null=True, blank=True)
+    process = models.ForeignKey(Process, related_name='+', on_delete=models.SET_NULL, null=True, blank=True)
+    get_in_touch = models.ForeignKey(GetInTouch, related_name='+', on_delete=models.SET_NULL, null=True, blank=True)
+    sections = models.ForeignKey(Sections, related_name='+', on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Site configuration'
+        verbose_name_plural = 'Site configuration'
+
+    def __str__(self):
+        return 'Site configuration'
+
 class Message(models.Model):
     name = models.CharField(max_length=255, null=True, blank=True)
     email = models.EmailField(null=True, blank=True)
@@ -145,25 +305,78 @@ class Message(models.Model):
 # New models for the Blog and Achievements sections
 class BlogPost(models.Model):
     title = models.CharField(max_length=255)
+    slug = models.SlugField(max_length=255, unique=True, blank=True)
     content = models.TextField()
     author = models.CharField(max_length=255, null=True, blank=True)
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Derived from content on save
+    content_html = models.TextField(blank=True, editable=False)
+    excerpt = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False)
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = unique_slug(BlogPost, self.title, exclude_pk=self.pk)
+        self.content_html, self.excerpt, self.word_count, self.reading_time = summarize_html(self.content)
+        super(BlogPost, self).save(*args, **kwargs)
     
     def __str__(self):
         return self.title
 
+    def get_absolute_url(self):
+        return reverse('blog_detail', args=[self.slug])
+
     class Meta:
         ordering = ['-created']
+        indexes = [
+            # Cards, and the (created, id) cursor of blog_list
+            active_index('blogpost_active_idx', '-created', '-id'),
+            active_index('blogpost_active_updated_idx', 'updated'),
+            # Admin changelist and its author filter
+            models.Index(fields=['-created', '-id'], name='blogpost_created_idx'),
+            models.Index(fields=['author'], name='blogpost_author_idx'),
+        ]
 
 class Achievement(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(null=True, blank=True)
     award_date = models.DateField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    # Derived from description on save
+    description_html = models.TextField(blank=True, editable=False)
+    excerpt = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False)
+
+    def save(self, *args, **kwargs):
+        self.description_html, self.excerpt, self.word_count, self.reading_time = summarize_html(self.description)
+        super(Achievement, self).save(*args, **kwargs)
     
     def __str__(self):
         return self.title
 
     class Meta:
         ordering = ['-award_date']
+        indexes = [
+            active_index('achievement_active_idx', '-award_date', '-id'),
+            models.Index(fields=['-award_date', '-id'], name='achievement_award_date_idx'),
+        ]
+
+class IconSymbol(models.Model):
+    '''minified icon, shared by every row with the same SVG'''
+    name = models.CharField(max_length=16, unique=True)
+    markup = models.TextField()
+
+    def __str__(self):
+        return self.name
+
+class PortfolioSnapshot(models.Model):
+    '''pre-joined content of every active section, rebuilt on content changes'''
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'Snapshot {self.updated:%Y-%m-%d %H:%M:%S}'
@@ -0,0 +1,123 @@
+import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+
+# capacity, tokens refilled per second
+IP_BUCKET = (5, 5 / 600)
+GLOBAL_BUCKET = (60, 1)
+DUPLICATE_WINDOW = 60 * 60
+PURGE_PROBABILITY = 0.01
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS bucket (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS seen (digest TEXT PRIMARY KEY, expires REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS rejection (reason TEXT PRIMARY KEY, count INTEGER NOT NULL);
+'''
+
+
+class RateLimiter:
+    """
+    Per-IP and global token buckets plus duplicate detection for the contact
+    form. State lives in a small SQLite file so every gunicorn worker on the
+    host shares it; each check is one short IMMEDIATE transaction and never
+    touches the Django database.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _take(self, conn, key, capacity, rate, now):
+        row = conn.execute('SELECT tokens, updated FROM bucket WHERE key = ?', (key,)).fetchone()
+        tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+        if tokens < 1:
+            return None
+        return tokens - 1
+
+    def check(self, ip, digest, accept=None):
+        """
+        Return the rejection reason, or None if the submission may proceed.
+        A passing submission is handed to ``accept`` before its tokens and
+        digest are recorded; if ``accept`` raises, nothing is recorded.
+        """
+        now = time.time()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            reason = None
+            if conn.execute('SELECT 1 FROM seen WHERE digest = ? AND expires > ?', (digest, now)).fetchone():
+                reason = 'duplicate'
+            else:
+                ip_tokens = self._take(conn, f'ip:{ip}', *IP_BUCKET, now)
+                global_tokens = self._take(conn, 'global', *GLOBAL_BUCKET, now)
+                if ip_tokens is None:
+                    reason = 'ip'
+                elif global_tokens is None:
+                    reason = 'global'
+
+            if reason is None:
+                if accept is not None:
+                    accept()
+                conn.executemany(
+                    'INSERT OR REPLACE INTO bucket (key, tokens, updated) VALUES (?, ?, ?)',
+                    [(f'ip:{ip}', ip_tokens, now), ('global', global_tokens, now)],
+                )
+                conn.execute(
+                    'INSERT OR REPLACE INTO seen (digest, expires) VALUES (?, ?)',
+                    (digest, now + DUPLICATE_WINDOW),
+                )
+            else:
+                conn.execute(
+                    'INSERT INTO rejection (reason, count) VALUES (?, 1) '
+                    'ON CONFLICT(reason) DO UPDATE SET count = count + 1',
+                    (reason,),
+                )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        if reason is None and random.random() < PURGE_PROBABILITY:
+            self.purge(now)
+        return reason
+
+    def purge(self, now=None):
+        """Drop expired duplicate hashes and idle, fully refilled IP buckets."""
+        now = now or time.time()
+        capacity, rate = IP_BUCKET
+        conn = self._connection()
+        conn.execute('DELETE FROM seen WHERE expires <= ?', (now,))
+        conn.execute("DELETE FROM bucket WHERE key LIKE 'ip:%' AND updated <= ?", (now - capacity / rate,))
+
+    def rejection_counts(self):
+        return dict(self._connection().execute('SELECT reason, count FROM rejection'))
+
+
+def client_ip(request):
+    if settings.USE_X_FORWARDED_FOR and 'HTTP_X_FORWARDED_FOR' in request.META:
+        # The address appended by our own proxy is the last one.
+        return request.META['HTTP_X_FORWARDED_FOR'].split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def submission_digest(data):
+    parts = ((data.get(field) or '').strip().lower() for field in ('name', 'email', 'message'))
+    return hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+
+
+limiter = RateLimiter(os.path.join(settings.BASE_DIR, 'cache', 'ratelimit.sqlite3'))
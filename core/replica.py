@@ -0,0 +1,138 @@
+"""
+Public pages read from a read-only copy of the database, so admin and
+contact form writes never hold them up. The copy is refreshed with the
+SQLite backup API when content is published, see core.signals.
+"""
+import functools
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .db import database_path
+
+logger = logging.getLogger(__name__)
+
+REPLICA = 'replica'
+# Set for a while after an admin write, see PinPrimaryMiddleware.
+PIN_COOKIE = 'read_primary'
+PIN_SECONDS = 60
+SAFE_METHODS = ('GET', 'HEAD')
+
+_reading_replica = ContextVar('reading_replica', default=False)
+
+
+def replica_path():
+    """Replica file, or None when no replica is configured or tests mirror it to the primary."""
+    if REPLICA not in settings.DATABASES:
+        return None
+    primary, replica = connections[DEFAULT_DB_ALIAS], connections[REPLICA]
+    if primary.is_in_memory_db() or replica.settings_dict['NAME'] == primary.settings_dict['NAME']:
+        return None
+    return database_path(replica.settings_dict)
+
+
+def refresh_replica():
+    """
+    Copy the primary into a new file and swap it in. Open replica
+    connections keep reading the old file until their next health check
+    (core.db), so no reader ever sees a half-written copy. When the copy
+    fails the replica is removed and public pages read the primary.
+    """
+    path = replica_path()
+    if path is None:
+        return
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        target = sqlite3.connect(tmp)
+        try:
+            primary.connection.backup(target)
+            # The replica is opened immutable: no WAL, no locks.
+            target.execute('PRAGMA journal_mode = delete').fetchall()
+        finally:
+            target.close()
+        # mkstemp creates the file private; readable like the primary instead.
+        shutil.copymode(database_path(primary.settings_dict), tmp)
+        os.replace(tmp, path)
+    except (OSError, sqlite3.Error):
+        logger.exception('Could not refresh the read replica; reading the primary.')
+        for name in (tmp, path):
+            try:
+                os.unlink(name)
+            except FileNotFoundError:
+                pass
+
+
+def _use_replica(request):
+    return (
+        request.method in SAFE_METHODS
+        and PIN_COOKIE not in request.COOKIES
+        and (path := replica_path()) is not None
+        and os.path.exists(path)
+    )
+
+
+def reads_replica(view):
+    """Route the ORM reads of a public view to the replica."""
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            token = _reading_replica.set(_use_replica(request))
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _reading_replica.reset(token)
+    else:
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            token = _reading_replica.set(_use_replica(request))
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                _reading_replica.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Reads of content inside reads_replica views go to the replica; every write goes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if _reading_replica.get() and model._meta.app_label == 'core':
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Also for rows that were read from the replica.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
+
+
+class PinPrimaryMiddleware:
+    """
+    Read-your-writes for editors: after a staff user changes something, their
+    browser reads the primary for PIN_SECONDS, in case the replica has not
+    caught up (or its refresh failed).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and getattr(request, 'user', None) and request.user.is_staff:
+            response.set_cookie(PIN_COOKIE, '1', max_age=PIN_SECONDS, httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,146 @@
+import math
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'em', 'h2', 'h3', 'h4', 'hr',
+    'i', 'img', 'li', 'ol', 'p', 'pre', 'span', 'strong', 'sub', 'sup', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'abbr': {'title'},
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+# '' is a relative or protocol-relative (//host) URL.
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto'}
+VOID_TAGS = {'br', 'hr', 'img'}
+# A new <li> or <p> implicitly ends an open sibling.
+IMPLICIT_END_TAGS = {'li', 'p'}
+# Dropped together with everything inside them.
+DROP_CONTENT_TAGS = {'script', 'style', 'template', 'iframe', 'object', 'noscript'}
+BLOCK_TAGS = {
+    'article', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'hr', 'li', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul',
+}
+
+EXCERPT_WORDS = 20
+WORDS_PER_MINUTE = 200
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        if tag in IMPLICIT_END_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        parts = [tag]
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES and urlsplit(value.strip()).scheme.lower() not in ALLOWED_SCHEMES:
+                continue
+            parts.append(f'{name}="{escape(value)}"')
+        if tag == 'a':
+            parts.append('rel="nofollow noopener"')
+        self.out.append(f'<{" ".join(parts)}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+        # Close anything left open inside this tag too.
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.out.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.out.append(f'</{self.open_tags.pop()}>')
+        return ''.join(self.out)
+
+
+def sanitize_html(value):
+    """
+    Reduce admin-entered HTML to a small allowlist of tags and attributes.
+    Unsafe URLs and scripts are removed and unclosed tags are closed.
+    """
+    if not value:
+        return ''
+    parser = _Sanitizer()
+    parser.feed(value)
+    return parser.close()
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+        # Block boundaries separate words even without whitespace in the source.
+        if tag in BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+        if tag in BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.parts.append(data)
+
+
+def html_to_text(value):
+    """Plain text of an HTML fragment with whitespace collapsed."""
+    if not value:
+        return ''
+    parser = _TextExtractor()
+    parser.feed(value)
+    parser.close()
+    return ' '.join(''.join(parser.parts).split())
+
+
+def summarize_html(value, excerpt_words=EXCERPT_WORDS):
+    """
+    Everything the templates need from an HTML body, computed once at save
+    time: (sanitized html, plain-text excerpt, word count, reading minutes).
+    """
+    words = html_to_text(value).split()
+    excerpt = ' '.join(words[:excerpt_words])
+    if len(words) > excerpt_words:
+        excerpt += '…'
+    reading_time = math.ceil(len(words) / WORDS_PER_MINUTE)
+    return sanitize_html(value), excerpt, len(words), reading_time
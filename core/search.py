@@ -0,0 +1,152 @@
+import re
+from html import escape
+
+from django.apps import apps as global_apps
+from django.db import connection, connections, transaction
+from django.urls import reverse
+
+from .sanitize import html_to_text
+
+TABLE = 'core_search'
+SCHEMA = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+    "title, body, url UNINDEXED, tokenize='porter unicode61 remove_diacritics 2')"
+)
+
+# kind -> (model name, title field, body field, label). The position of a kind
+# in this dict is part of the rowid (pk * KIND_SLOTS + position), so a row is
+# found by primary key instead of scanning an UNINDEXED column. Append only.
+KINDS = {
+    'project': ('Project', 'title', 'description', 'Project'),
+    'post': ('BlogPost', 'title', 'content', 'Article'),
+    'skill': ('Skill', 'title', None, 'Skill'),
+    'achievement': ('Achievement', 'title', 'description', 'Achievement'),
+}
+KIND_SLOTS = 8
+KIND_BY_MODEL = {model_name: kind for kind, (model_name, *_) in KINDS.items()}
+_KIND_LIST = list(KINDS)
+
+# Search weights for title and body.
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+SNIPPET_TOKENS = 16
+MAX_QUERY_TERMS = 8
+RESULT_LIMIT = 20
+# bm25 has to score every match before it can sort, which grows with the
+# index for common words. Only the newest CANDIDATE_LIMIT matches are ranked.
+CANDIDATE_LIMIT = 1000
+BATCH_SIZE = 1000
+
+# Private-use code points mark matches in snippets until the text is escaped.
+_OPEN, _CLOSE = '\ue000', '\ue001'
+
+
+def _rowid(kind, pk):
+    return pk * KIND_SLOTS + _KIND_LIST.index(kind)
+
+
+def _url(kind, obj):
+    if kind == 'post':
+        return reverse('blog_detail', args=[obj.slug])
+    if kind == 'project' and obj.demo_url:
+        return obj.demo_url
+    return reverse('index') + ('#skills' if kind == 'skill' else f'#{kind}s')
+
+
+def _document(kind, obj):
+    _, title_field, body_field, _ = KINDS[kind]
+    body = html_to_text(getattr(obj, body_field)) if body_field else ''
+    return (_rowid(kind, obj.pk), getattr(obj, title_field) or '', body, _url(kind, obj))
+
+
+def index_object(instance):
+    """Add, refresh or (for inactive rows) remove one object from the index."""
+    kind = KIND_BY_MODEL[type(instance).__name__]
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [_rowid(kind, instance.pk)])
+        if instance.is_active:
+            cursor.execute(f'INSERT INTO {TABLE} (rowid, title, body, url) VALUES (%s, %s, %s, %s)', _document(kind, instance))
+
+
+def unindex_object(instance):
+    kind = KIND_BY_MODEL[type(instance).__name__]
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [_rowid(kind, instance.pk)])
+
+
+def rebuild_index(apps=global_apps, batch_size=BATCH_SIZE, using='default'):
+    """
+    Re-create the index from the database in pk-ordered batches, in one
+    transaction so searches keep seeing the old index until it commits.
+    Returns the number of indexed documents per kind.
+    """
+    counts = {}
+    with transaction.atomic(using=using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLE}')
+            for kind, (model_name, title_field, body_field, _) in KINDS.items():
+                model = apps.get_model('core', model_name)
+                fields = ['pk', title_field] + ([body_field] if body_field else [])
+                fields += {'post': ['slug'], 'project': ['demo_url']}.get(kind, [])
+                queryset = model.objects.using(using).filter(is_active=True).only(*fields).order_by('pk')
+                counts[kind] = 0
+                last_pk = 0
+                while True:
+                    batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+                    if not batch:
+                        break
+                    cursor.executemany(
+                        f'INSERT INTO {TABLE} (rowid, title, body, url) VALUES (%s, %s, %s, %s)',
+                        [_document(kind, obj) for obj in batch],
+                    )
+                    counts[kind] += len(batch)
+                    last_pk = batch[-1].pk
+            # Merge the b-tree segments written by the batches.
+            cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+    return counts
+
+
+def match_expression(query):
+    """Turn free text into a safe FTS5 query in which every word must match."""
+    terms = re.findall(r'\w+', query.lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"' for term in terms)
+
+
+def _marked(text):
+    return escape(text).replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>')
+
+
+def search(query, limit=RESULT_LIMIT):
+    """
+    Best matches by bm25 with highlighted titles and snippets, in one query.
+    Highlighting runs only for the ``limit`` rows that are returned.
+    """
+    expression = match_expression(query)
+    if expression is None:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH candidate AS ("
+            f"  SELECT rowid, bm25({TABLE}, %s, %s) AS score FROM {TABLE} WHERE {TABLE} MATCH %s"
+            f"  ORDER BY rowid DESC LIMIT %s"
+            f"), top AS (SELECT rowid, score FROM candidate ORDER BY score LIMIT %s) "
+            f"SELECT {TABLE}.rowid, url, highlight({TABLE}, 0, %s, %s), snippet({TABLE}, 1, %s, %s, '…', %s) "
+            f"FROM top JOIN {TABLE} ON {TABLE}.rowid = top.rowid WHERE {TABLE} MATCH %s ORDER BY top.score",
+            [TITLE_WEIGHT, BODY_WEIGHT, expression, CANDIDATE_LIMIT, limit,
+             _OPEN, _CLOSE, _OPEN, _CLOSE, SNIPPET_TOKENS, expression],
+        )
+        rows = cursor.fetchall()
+    results = []
+    for rowid, url, title, snippet in rows:
+        kind = _KIND_LIST[rowid % KIND_SLOTS]
+        results.append({
+            'kind': kind,
+            'label': KINDS[kind][3],
+            'id': rowid // KIND_SLOTS,
+            'url': url,
+            'title': _marked(title),
+            'snippet': _marked(snippet),
+        })
+    return results
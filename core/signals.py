@@ -0,0 +1,85 @@
+from django.core.signals import request_started
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+
+from .cache import bump_content_version
+from .content import forget_site_configuration
+from .db import close_unhealthy_connections, configure_connection
+from .images import IMAGE_FIELDS, image_deleted, image_saved
+from .models import *
+from .replica import refresh_replica
+from .search import index_object, unindex_object
+from .snapshot import rebuild_snapshot
+
+# Every model rendered on the public site. Message is write-only and excluded.
+CONTENT_MODELS = (
+    MetaData, Hero, About, Project, Skill, SlkillGroup, Process, Step,
+    GetInTouch, InfoItem, SocialLink, Sections, BlogPost, Achievement,
+)
+
+# Models with rows in the full-text search index.
+SEARCH_MODELS = (Project, BlogPost, Skill, Achievement)
+
+
+def publish_content():
+    # Snapshot, then replica: pages rendered for the new version must read both.
+    # The snapshot reads the active rows through the committed pointers.
+    forget_site_configuration()
+    rebuild_snapshot()
+    refresh_replica()
+    bump_content_version()
+
+
+def on_commit_once(func):
+    # An admin save with inlines fires many signals; queue func once per transaction.
+    connection = transaction.get_connection()
+    if connection.in_atomic_block and any(queued is func for _, queued, _ in connection.run_on_commit):
+        return
+    transaction.on_commit(func)
+
+
+def content_changed(sender, **kwargs):
+    # Publish after commit so a concurrent render cannot see pre-commit rows
+    # under the new version.
+    on_commit_once(publish_content)
+
+
+for model in CONTENT_MODELS:
+    post_save.connect(content_changed, sender=model, dispatch_uid=f'content_saved_{model.__name__}')
+    post_delete.connect(content_changed, sender=model, dispatch_uid=f'content_deleted_{model.__name__}')
+
+m2m_changed.connect(content_changed, sender=Project.skill.through, dispatch_uid='content_m2m_project_skill')
+
+
+def search_saved(sender, instance, raw=False, **kwargs):
+    # Same transaction as the save, so the index never disagrees with the rows.
+    if not raw:
+        index_object(instance)
+
+
+def search_deleted(sender, instance, **kwargs):
+    unindex_object(instance)
+
+
+for model in SEARCH_MODELS:
+    post_save.connect(search_saved, sender=model, dispatch_uid=f'search_saved_{model.__name__}')
+    post_delete.connect(search_deleted, sender=model, dispatch_uid=f'search_deleted_{model.__name__}')
+
+for model in IMAGE_FIELDS:
+    post_save.connect(image_saved, sender=model, dispatch_uid=f'image_saved_{model.__name__}')
+    post_delete.connect(image_deleted, sender=model, dispatch_uid=f'image_deleted_{model.__name__}')
+
+connection_created.connect(configure_connection, dispatch_uid='sqlite_pragmas')
+request_started.connect(close_unhealthy_connections, dispatch_uid='sqlite_health_checks')
+
+
+def migrated(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    # Schema changes reach the snapshot and replica at once; this also
+    # creates both on the first deploy, before any request can miss them.
+    if using == DEFAULT_DB_ALIAS:
+        publish_content()
+
+
+post_migrate.connect(migrated, sender=apps.get_app_config('core'), dispatch_uid='replica_migrated')
@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+
+from django.contrib.sitemaps import Sitemap
+from django.contrib.sitemaps import views as sitemap_views
+from django.db.models import Max
+from django.urls import reverse
+
+from .cache import get_content_version
+from .models import BlogPost
+
+
+class PageSitemap(Sitemap):
+    changefreq = 'weekly'
+
+    def items(self):
+        return ['index', 'blog_list']
+
+    def location(self, item):
+        return reverse(item)
+
+    def priority(self, item):
+        return 1.0 if item == 'index' else 0.8
+
+    def lastmod(self, item):
+        if item == 'index':
+            # Every content change bumps the version, see core.signals.
+            return datetime.fromtimestamp(get_content_version() / 1e9, tz=timezone.utc)
+        return BlogPost.objects.filter(is_active=True).aggregate(latest=Max('updated'))['latest']
+
+
+class BlogPostSitemap(Sitemap):
+    changefreq = 'monthly'
+    priority = 0.6
+
+    def items(self):
+        # Same order as the cards, so it reads blogpost_active_idx.
+        return BlogPost.objects.filter(is_active=True).only('slug', 'updated').order_by('-created', '-pk')
+
+    def lastmod(self, post):
+        return post.updated
+
+
+# There are no project detail pages; projects are part of the homepage.
+SITEMAPS = {
+    'pages': PageSitemap,
+    'blog': BlogPostSitemap,
+}
+
+
+def needs_index():
+    """A single urlset holds at most Sitemap.limit (50,000) URLs."""
+    return sum(sitemap().paginator.count for sitemap in SITEMAPS.values()) > Sitemap.limit
+
+
+def render_sitemap(request, section=None):
+    """
+    sitemap.xml as bytes: one urlset, or a sitemap index pointing at
+    paginated per-section sitemaps once it outgrows a single file.
+    """
+    if section is None and needs_index():
+        response = sitemap_views.index(request, SITEMAPS, sitemap_url_name='sitemap_section')
+    else:
+        response = sitemap_views.sitemap(request, SITEMAPS, section=section)
+    return response.render().content
@@ -0,0 +1,107 @@
+from django.db import transaction
+
+from .content import aget_index_context, get_index_context
+from .icons import SPRITE_CONTEXT_KEY, SPRITE_SYMBOLS_KEY, update_sprite
+from .models import *
+
+SNAPSHOT_PK = 1
+
+# context key -> (model, many, {to_attr: child model})
+SCHEMA = {
+    'metadata': (MetaData, False, {}),
+    'hero': (Hero, False, {}),
+    'about': (About, False, {}),
+    'process': (Process, False, {'active_steps': Step}),
+    'skillgroups': (SlkillGroup, True, {'active_skills': Skill}),
+    'projects': (Project, True, {'active_skills': Skill}),
+    'blog_posts': (BlogPost, True, {}),
+    'achievements': (Achievement, True, {}),
+    'get_in_touch': (GetInTouch, False, {'active_info_items': InfoItem, 'active_social_links': SocialLink}),
+    'sections': (Sections, False, {}),
+}
+
+
+def _dump(obj, children):
+    data = {}
+    deferred = obj.get_deferred_fields()
+    for field in obj._meta.concrete_fields:
+        if field.attname in deferred:
+            continue
+        value = field.value_from_object(obj)
+        if isinstance(field, models.FileField):
+            value = value.name or ''
+        data[field.attname] = value
+    for attr in children:
+        data[attr] = [_dump(child, {}) for child in getattr(obj, attr)]
+    return data
+
+
+def _load(model, data, children):
+    values = {}
+    for field in model._meta.concrete_fields:
+        if field.attname in data:
+            values[field.attname] = field.to_python(data[field.attname])
+    obj = model(**values)
+    for attr, child_model in children.items():
+        setattr(obj, attr, [_load(child_model, child, {}) for child in data.get(attr, [])])
+    return obj
+
+
+def build_snapshot_data(previous=None):
+    """
+    Serialize the homepage context into plain values for the JSON field.
+    ``previous`` is the data of the snapshot being replaced, if any.
+    """
+    context = get_index_context()
+    data = {}
+    for key, (model, many, children) in SCHEMA.items():
+        value = context[key]
+        if many:
+            data[key] = [_dump(obj, children) for obj in value]
+        else:
+            data[key] = _dump(value, children) if value is not None else None
+    # Written here, outside any render; {% icon %} only reads the name.
+    previous = previous or {}
+    data[SPRITE_CONTEXT_KEY], data[SPRITE_SYMBOLS_KEY] = update_sprite(
+        previous.get(SPRITE_CONTEXT_KEY, ''), previous.get(SPRITE_SYMBOLS_KEY),
+    )
+    return data
+
+
+def rebuild_snapshot():
+    with transaction.atomic():
+        previous = PortfolioSnapshot.objects.filter(pk=SNAPSHOT_PK).values_list('data', flat=True).first()
+        snapshot, _ = PortfolioSnapshot.objects.update_or_create(
+            pk=SNAPSHOT_PK, defaults={'data': build_snapshot_data(previous)},
+        )
+    return snapshot
+
+
+def _context_from(snapshot):
+    context = {}
+    for key, (model, many, children) in SCHEMA.items():
+        value = snapshot.data.get(key)
+        if many:
+            context[key] = [_load(model, item, children) for item in value or []]
+        else:
+            context[key] = _load(model, value, children) if value is not None else None
+    context[SPRITE_CONTEXT_KEY] = snapshot.data.get(SPRITE_CONTEXT_KEY, '')
+    return context
+
+
+def load_index_context():
+    """Homepage context read from the snapshot row with a single query."""
+    snapshot = PortfolioSnapshot.objects.filter(pk=SNAPSHOT_PK).first()
+    if snapshot is None:
+        # Built by migrate and every publish; reads never write it, as they
+        # may be reading the replica.
+        return get_index_context()
+    return _context_from(snapshot)
+
+
+async def aload_index_context():
+    snapshot = await PortfolioSnapshot.objects.filter(pk=SNAPSHOT_PK).afirst()
+    if snapshot is None:
+        # See load_index_context.
+        return await aget_index_context()
+    return _context_from(snapshot)
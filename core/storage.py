@@ -0,0 +1,28 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+
+HASH_LENGTH = 12
+
+
+class HashedMediaStorage(FileSystemStorage):
+    """
+    Stores uploads as ``<name>.<content hash><ext>``. A URL then always
+    refers to the same bytes and can be cached forever (see core.media), and
+    uploading the same file twice stores it once.
+    """
+
+    def save(self, name, content, max_length=None):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        root, ext = os.path.splitext(name)
+        suffix = f'.{digest.hexdigest()[:HASH_LENGTH]}{ext}'
+        if max_length is not None:
+            root = root[:max_length - len(suffix)]
+        name = root + suffix
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
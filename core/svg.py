@@ -0,0 +1,110 @@
+"""
+Minifies admin-entered SVG icons into sprite <symbol>s. Nothing here imports
+Django, see core.icons for the sprite itself.
+"""
+import hashlib
+import re
+import xml.etree.ElementTree as ET
+from html import escape
+
+HASH_LENGTH = 12
+# Root attributes that size or identify the pasted <svg>; the template's <svg>
+# around <use> takes their place.
+DROPPED_ROOT_ATTRIBUTES = {'width', 'height', 'class', 'id', 'x', 'y', 'version', 'style'}
+SYMBOL_ATTRIBUTES = {'viewBox', 'preserveAspectRatio'}
+# Never meaningful in an icon, and scripts must not reach the sprite.
+DROPPED_TAGS = {'script', 'metadata', 'foreignObject', 'desc', 'title', 'style'}
+# Stands for the symbol name until it is known.
+PREFIX = '@@symbol@@-'
+LOCAL_REFERENCE = re.compile(r'(url\(\s*["\']?#|^#)([\w.-]+)')
+PATH_ATTRIBUTES = {'d', 'points'}
+# A zero before the point of a number that does not continue another number.
+LEADING_ZERO = re.compile(r'(?<![\d.])0\.(?=\d)')
+
+
+def _local_name(name):
+    return name.rsplit('}', 1)[-1]
+
+
+def _minify_path(data):
+    """Shorter but equivalent path data: 0.5 -> .5, no spaces around commands or before minus signs."""
+    data = LEADING_ZERO.sub('.', data)
+    data = re.sub(r'\s*([a-zA-Z])\s*', r'\1', data)
+    data = re.sub(r'\s*,\s*', ',', data)
+    data = re.sub(r'[\s,]+(?=-)', '', data)
+    return re.sub(r'\s+', ' ', data).strip()
+
+
+def _referenced_ids(root):
+    return {
+        match.group(2)
+        for element in root.iter() for value in element.attrib.values()
+        for match in LOCAL_REFERENCE.finditer(value)
+    }
+
+
+def _clean(element, referenced):
+    """
+    Strip namespaces, whitespace, event handlers, dropped children and unused
+    ids in place. Ids still in use are prefixed with the symbol name.
+    """
+    element.tag = _local_name(element.tag)
+    attributes = {}
+    for name, value in element.attrib.items():
+        name = _local_name(name)
+        if name.startswith('on') or (name == 'id' and value not in referenced):
+            continue
+        if name == 'id':
+            value = PREFIX + value
+        elif name in PATH_ATTRIBUTES:
+            value = _minify_path(value)
+        else:
+            value = LOCAL_REFERENCE.sub(lambda m: m.group(1) + PREFIX + m.group(2), value)
+        attributes[name] = value.strip()
+    element.attrib = attributes
+    if element.text and not element.text.strip():
+        element.text = None
+    for child in list(element):
+        if _local_name(child.tag) in DROPPED_TAGS:
+            element.remove(child)
+            continue
+        _clean(child, referenced)
+        if child.tail and not child.tail.strip():
+            child.tail = None
+
+
+def minify_svg(markup):
+    """
+    ``(name, <symbol> markup)`` for one pasted <svg>, where ``name`` is a hash
+    of the minified icon so identical icons share a symbol. None when
+    ``markup`` is not a well-formed <svg>.
+    """
+    try:
+        root = ET.fromstring((markup or '').strip())
+    except ET.ParseError:
+        return None
+    if _local_name(root.tag) != 'svg':
+        return None
+    # Ids inside the icon (gradients, clip paths) get the symbol name as a
+    # prefix so icons cannot collide in the sprite. Hashed with a placeholder.
+    _clean(root, _referenced_ids(root))
+    symbol = {name: value for name, value in root.attrib.items() if name in SYMBOL_ATTRIBUTES}
+    inherited = {
+        name: value for name, value in root.attrib.items()
+        if name not in SYMBOL_ATTRIBUTES and name not in DROPPED_ROOT_ATTRIBUTES and ':' not in name and name != 'xmlns'
+    }
+    body = ''.join(ET.tostring(child, encoding='unicode') for child in root)
+    if inherited:
+        # Presentation attributes of the root (fill, stroke...) apply to every shape.
+        group = ET.Element('g', inherited)
+        body = ET.tostring(group, encoding='unicode').replace(' />', f'>{body}</g>')
+    body = body.replace(' />', '/>')
+    attributes = ''.join(f' {name}="{escape(value)}"' for name, value in sorted(symbol.items()))
+    digest = hashlib.sha256(f'{attributes}|{body}'.encode()).hexdigest()[:HASH_LENGTH]
+    name = f'i{digest}'
+    return name, f'<symbol id="{name}"{attributes}>{body}</symbol>'.replace(PREFIX, f'{name}-')
+
+
+def sprite(symbols):
+    """One SVG document holding ``symbols``, for <use href="sprite#name">."""
+    return f'<svg xmlns="http://www.w3.org/2000/svg">{"".join(symbols)}</svg>'
@@ -0,0 +1,32 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from core.cache import template_mtime_ns
+from core.critical_css import critical_css as extract_critical_css
+
+register = template.Library()
+
+
+@register.simple_tag
+def critical_css(path, *template_names):
+    """
+    Inline <style> with the rules of static file ``path`` that the markup of
+    ``template_names`` uses, so the first paint needs no stylesheet request.
+    """
+    css = extract_critical_css(path, template_names, template_mtime_ns())
+    # Stylesheet text from our own static files; only "</style" could break out.
+    return mark_safe('<style>' + css.replace('</', '<\\/') + '</style>')
+
+
+@register.simple_tag
+def deferred_stylesheet(url):
+    """Stylesheet that loads without blocking the first render, plain link without JavaScript."""
+    if not url.startswith(('http://', 'https://', '//')):
+        url = static(url)
+    return format_html(
+        '<link rel="preload" href="{}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        '<noscript><link rel="stylesheet" href="{}"></noscript>',
+        url, url,
+    )
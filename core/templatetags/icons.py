@@ -0,0 +1,25 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from core.icons import SPRITE_CONTEXT_KEY
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def icon(context, obj, css_class=''):
+    """
+    <svg><use> referencing ``obj.icon`` in the sprite, which browsers cache
+    across pages. Icons that are not plain SVG are inlined as entered, as are
+    all icons when the context has no sprite (no snapshot yet). Only reads
+    the context: safe while rendering inside async views.
+    """
+    name = context.get(SPRITE_CONTEXT_KEY) if obj.icon_symbol else ''
+    if not name:
+        return mark_safe(obj.icon or '')
+    return format_html(
+        '<svg class="{}" aria-hidden="true" focusable="false"><use href="{}#{}"></use></svg>',
+        css_class, default_storage.url(name), obj.icon_symbol,
+    )
@@ -0,0 +1,62 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+from core.images import is_current
+
+register = template.Library()
+
+# Width of the <img src> fallback for browsers without srcset support.
+FALLBACK_WIDTH = 960
+
+
+@register.filter
+def srcset(variants, fmt='jpeg'):
+    """``srcset`` value for one format of an image's derivatives."""
+    return ', '.join(f'{default_storage.url(name)} {width}w' for width, name in variants.get(fmt, []))
+
+
+def _img_attributes(obj, field, alt, css_class):
+    """Intrinsic size and blur-up background stored at upload, see core.images."""
+    attributes = [('loading', 'lazy'), ('alt', alt), ('class', css_class)]
+    width, height = getattr(obj, f'{field}_width'), getattr(obj, f'{field}_height')
+    if width and height:
+        attributes += [('width', width), ('height', height)]
+    color, placeholder = getattr(obj, f'{field}_color'), getattr(obj, f'{field}_placeholder')
+    if color or placeholder:
+        background = color or ''
+        if placeholder:
+            background += f' url({placeholder}) center / cover no-repeat'
+        attributes.append(('style', f'background: {background.strip()}'))
+    return format_html_join(' ', '{}="{}"', attributes)
+
+
+@register.simple_tag
+def picture(obj, field, sizes='100vw', alt='', css_class=''):
+    """
+    <picture> for ``obj.<field>`` with WebP and JPEG sources at every
+    derivative width. Falls back to the uploaded file until its derivatives
+    have been rendered. Never opens the file.
+    """
+    image = getattr(obj, field)
+    if not image:
+        return ''
+    attributes = _img_attributes(obj, field, alt, css_class)
+    variants = getattr(obj, f'{field}_variants')
+    if not is_current(image, variants):
+        return format_html('<img src="{}" {}>', image.url, attributes)
+    jpeg = variants['jpeg']
+    fallback = next((name for width, name in reversed(jpeg) if width <= FALLBACK_WIDTH), jpeg[0][1])
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" {}></picture>',
+        srcset(variants, 'webp'), sizes, default_storage.url(fallback), srcset(variants, 'jpeg'), sizes, attributes,
+    )
+
+
+@register.simple_tag
+def thumbnail_url(image, variants):
+    """Small JPEG for admin previews, or the uploaded file."""
+    if is_current(image, variants):
+        return default_storage.url(variants['thumb'])
+    return image.url if image else ''
@@ -0,0 +1,27 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+# Tests never touch the site's file-based cache: it outlives the test
+# database, so keys written by a test would be served to the live site.
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'core-tests',
+    }
+}
+
+
+class TestRunner(DiscoverRunner):
+    """
+    DiscoverRunner with TEST_CACHES in place before the test databases are
+    created, since migrate publishes content (core.signals.migrated).
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.caches = override_settings(CACHES=TEST_CACHES)
+        self.caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.caches.disable()
+        super().teardown_test_environment(**kwargs)
@@ -1,3 +1,553 @@
-from django.test import TestCase
+import os
+import queue
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, connection, transaction
+from django.template.loader import render_to_string
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from .cache import bump_content_version, page_cache_stats
+from .content import active_pks, get_index_context
+from .icons import SPRITE_CONTEXT_KEY
+from .inbox import MessageWriter
+from .models import *
+from .ratelimit import RateLimiter
+from .sanitize import sanitize_html
+from .search import rebuild_index, search
+from .snapshot import rebuild_snapshot
+from .testing import TEST_CACHES
+
+
+def query_plan(sql):
+    """Steps of SQLite's EXPLAIN QUERY PLAN for one statement."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def top_level(sql):
+    """sql without its parenthesized parts, such as subqueries."""
+    depth, kept = 0, []
+    for char in sql:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif depth == 0:
+            kept.append(char)
+    return ''.join(kept)
+
+
+def plan_problems(sql):
+    """
+    Steps that sort in a temporary B-tree, or that read a whole table for a
+    filtered statement. Listing every row of a table (admin changelists
+    without filters) is a scan by nature and passes; the subqueries of such
+    a listing must still search an index.
+    """
+    outer = top_level(sql)
+    filtered = ' WHERE ' in outer
+
+    def full_scan(step):
+        if not step.startswith('SCAN ') or ' USING ' in step:
+            return False
+        return filtered or f'"{step.split()[1]}"' not in outer
+
+    return [step for step in query_plan(sql) if 'TEMP B-TREE' in step or full_scan(step)]
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CacheTestCase(TestCase):
+    """
+    TestCase on an empty in-memory cache. core.testing.TestRunner already
+    swaps it in; the override also covers other runners.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+
+class QueryPlanAssertions:
+    def assertQueriesIndexed(self, func):
+        """Run func and fail if any SELECT it sends for core tables needs a full scan or a sort."""
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        statements = {q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT') and '"core_' in q['sql']}
+        self.assertTrue(statements, 'No queries were captured.')
+        problems = {sql: steps for sql in sorted(statements) if (steps := plan_problems(sql))}
+        self.assertFalse(problems, '\n\n'.join(f'{sql}\n  {steps}' for sql, steps in problems.items()))
+
+
+class QueryPlanTests(QueryPlanAssertions, CacheTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        MetaData.objects.create(title='Portfolio')
+        Hero.objects.create(full_name='Lloyd')
+        About.objects.create(about='About me')
+        Sections.objects.create()
+        group = SlkillGroup.objects.create(title='Backend')
+        process = Process.objects.create(description='How I work')
+        get_in_touch = GetInTouch.objects.create(title='Contact')
+        for i in range(20):
+            active = i % 4 != 0
+            skill = Skill.objects.create(title=f'Skill {i}', group=group, is_active=active)
+            project = Project.objects.create(title=f'Project {i}', ordering_index=i % 5, is_active=active)
+            project.skill.add(skill)
+            Step.objects.create(title=f'Step {i}', process=process, is_active=active)
+            InfoItem.objects.create(key=f'Item {i}', get_in_touch=get_in_touch, is_active=active)
+            SocialLink.objects.create(title=f'Link {i}', get_in_touch=get_in_touch, is_active=active)
+            BlogPost.objects.create(title=f'Post {i}', content='<p>Body</p>', author=f'Author {i % 3}', is_active=active)
+            Achievement.objects.create(title=f'Award {i}', is_active=active)
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def test_index_queries(self):
+        def load():
+            for value in get_index_context().values():
+                if hasattr(value, '__iter__'):
+                    list(value)
+        self.assertQueriesIndexed(load)
+
+    def test_blog_and_sitemap_queries(self):
+        post = BlogPost.objects.filter(is_active=True)[3]
+        urls = ['/blog/', f'/blog/?after={int(post.created.timestamp() * 1e6)}-{post.pk}', '/sitemap.xml', '/sitemap-blog.xml']
+        self.assertQueriesIndexed(lambda: [self.client.get(url, HTTP_HOST='localhost') for url in urls])
+
+    def test_admin_changelists(self):
+        self.client.force_login(self.admin)
+        urls = []
+        for model in (MetaData, Hero, About, SlkillGroup, Skill, Project, Process, Step, GetInTouch, InfoItem, SocialLink):
+            url = f'/admin/core/{model._meta.model_name}/'
+            urls += [url, url + '?is_active=1']
+        for model in (BlogPost, Achievement):
+            url = f'/admin/core/{model._meta.model_name}/'
+            urls += [url, url + '?is_active__exact=1']
+
+        def load():
+            for url in urls:
+                self.assertEqual(self.client.get(url).status_code, 200, url)
+        self.assertQueriesIndexed(load)
+
+
+class ActiveSingletonTests(CacheTestCase):
+    def pointer(self, field):
+        return getattr(SiteConfiguration.objects.get(pk=SITE_CONFIGURATION_PK), f'{field}_id')
+
+    def test_activating_deactivates_previous_row_by_pk(self):
+        first = Hero.objects.create(full_name='First')
+        second = Hero.objects.create(full_name='Second', is_active=False)
+        self.assertEqual(self.pointer('hero'), first.pk)
+
+        second.is_active = True
+        with CaptureQueriesContext(connection) as queries:
+            second.save()
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "core_hero" SET "is_active"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn(f'"core_hero"."id" = {first.pk}', updates[0])
+        first.refresh_from_db()
+        self.assertFalse(first.is_active)
+        self.assertEqual(self.pointer('hero'), second.pk)
+
+        second.is_active = False
+        second.save()
+        self.assertIsNone(self.pointer('hero'))
+
+    def test_admin_form_activates_new_row(self):
+        first = Hero.objects.create(full_name='First')
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(admin)
+        response = self.client.post('/admin/core/hero/add/', {
+            'greeting': "Hello I'm", 'full_name': 'Second', 'title': '', 'resume_url': '', 'bio': '', 'is_active': 'on',
+        })
+        self.assertRedirects(response, '/admin/core/hero/')
+        second = Hero.objects.get(full_name='Second')
+        self.assertTrue(second.is_active)
+        first.refresh_from_db()
+        self.assertFalse(first.is_active)
+        self.assertEqual(self.pointer('hero'), second.pk)
+
+        response = self.client.post(f'/admin/core/hero/{first.pk}/change/', {
+            'greeting': "Hello I'm", 'full_name': 'First', 'title': '', 'resume_url': '', 'bio': '', 'is_active': 'on',
+        })
+        self.assertRedirects(response, '/admin/core/hero/')
+        self.assertEqual(self.pointer('hero'), first.pk)
+        self.assertEqual(Hero.objects.filter(is_active=True).get(), first)
+
+    def test_one_active_row_per_table(self):
+        Hero.objects.create(full_name='First')
+        second = Hero.objects.create(full_name='Second', is_active=False)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Hero.objects.filter(pk=second.pk).update(is_active=True)
+
+    def test_sections_keeps_first_row(self):
+        first = Sections.objects.create()
+        Sections.objects.create()
+        self.assertEqual(self.pointer('sections'), first.pk)
+        first.delete()
+        self.assertIsNone(self.pointer('sections'))
+
+    def test_homepage_reads_pointed_rows(self):
+        Hero.objects.create(full_name='First')
+        hero = Hero.objects.create(full_name='Second')
+        about = About.objects.create(about='About me')
+        context = get_index_context()
+        self.assertEqual(context['hero'], hero)
+        self.assertEqual(context['about'], about)
+        self.assertIsNone(context['metadata'])
+        # Cached until the next publish forgets it.
+        with self.assertNumQueries(0):
+            active_pks()
+
+
+class AdminChangelistQueryTests(CacheTestCase):
+    CHANGELISTS = ('slkillgroup', 'project', 'process', 'getintouch')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def add_rows(self, count):
+        """count rows per changelist, each with one active and one inactive child."""
+        groups = SlkillGroup.objects.bulk_create(SlkillGroup(title=f'Group {i}') for i in range(count))
+        skills = Skill.objects.bulk_create(
+            Skill(title=f'Skill {i}', group=group, is_active=i % 2 == 0) for i, group in enumerate(g for g in groups for _ in range(2))
+        )
+        projects = Project.objects.bulk_create(Project(title=f'Project {i}', ordering_index=i) for i in range(count))
+        Project.skill.through.objects.bulk_create(
+            Project.skill.through(project=project, skill=skill) for project, skill in zip(projects, skills)
+        )
+        # Bulk creation skips ActiveSingleton.save; keep the single-active constraints.
+        processes = Process.objects.bulk_create(Process(description=f'Process {i}', is_active=False) for i in range(count))
+        Step.objects.bulk_create(
+            Step(title=f'Step {i}', process=process, is_active=i % 2 == 0) for i, process in enumerate(p for p in processes for _ in range(2))
+        )
+        touches = GetInTouch.objects.bulk_create(GetInTouch(title=f'Contact {i}', is_active=False) for i in range(count))
+        InfoItem.objects.bulk_create(
+            InfoItem(key=f'Item {i}', get_in_touch=touch, is_active=i % 2 == 0) for i, touch in enumerate(t for t in touches for _ in range(2))
+        )
+        SocialLink.objects.bulk_create(
+            SocialLink(title=f'Link {i}', get_in_touch=touch, is_active=i % 2 == 0) for i, touch in enumerate(t for t in touches for _ in range(2))
+        )
+
+    def changelist_queries(self):
+        counts = {}
+        for name in self.CHANGELISTS:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(f'/admin/core/{name}/')
+            self.assertEqual(response.status_code, 200, name)
+            counts[name] = len(queries)
+        return counts
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.client.force_login(self.admin)
+        self.add_rows(10)
+        small = self.changelist_queries()
+        self.add_rows(990)
+        self.assertEqual(self.changelist_queries(), small)
+
+    def test_counts(self):
+        self.client.force_login(self.admin)
+        self.add_rows(1)
+        expected = {
+            'slkillgroup': ['<strong>2</strong> total', '1 active'],
+            'project': ['border-radius: 12px;">1</span>'],
+            'process': ['>1/2</span>'],
+            'getintouch': ['<span style="color: green;">1</span> / <span style="color: #666;">2</span> active'],
+        }
+        for name, fragments in expected.items():
+            response = self.client.get(f'/admin/core/{name}/')
+            for fragment in fragments:
+                self.assertContains(response, fragment)
+
+
+class HomepageQueryTests(CacheTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.process = Process.objects.create(description='Process')
+        cls.touch = GetInTouch.objects.create(title='Contact')
+        Sections.objects.create()
+
+    def add_rows(self, count):
+        """count rows per homepage list; every other skill, step, item and link is inactive."""
+        start = Project.objects.count()
+        numbers = range(start, start + count)
+        groups = SlkillGroup.objects.bulk_create(SlkillGroup(title=f'Group {i}') for i in numbers)
+        skills = Skill.objects.bulk_create(
+            Skill(title=f'Skill {i}', group=group, is_active=i % 2 == 0) for i, group in enumerate(g for g in groups for _ in range(2))
+        )
+        projects = Project.objects.bulk_create(Project(title=f'Project {i}', ordering_index=i) for i in numbers)
+        Project.skill.through.objects.bulk_create(
+            Project.skill.through(project=project, skill=skill) for project, skill in zip(projects, skills)
+        )
+        BlogPost.objects.bulk_create(BlogPost(title=f'Post {i}', slug=f'post-{i}', content='') for i in numbers)
+        Achievement.objects.bulk_create(Achievement(title=f'Achievement {i}') for i in numbers)
+        Step.objects.bulk_create(Step(title=f'Step {i}', process=self.process, is_active=i % 2 == 0) for i in numbers)
+        InfoItem.objects.bulk_create(InfoItem(key=f'Item {i}', get_in_touch=self.touch, is_active=i % 2 == 0) for i in numbers)
+        SocialLink.objects.bulk_create(SocialLink(title=f'Link {i}', get_in_touch=self.touch, is_active=i % 2 == 0) for i in numbers)
+
+    def homepage_queries(self):
+        """Queries to load and render the homepage from the database, without cached pks."""
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            html = render_to_string('index.html', get_index_context())
+        return len(queries), html
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.add_rows(10)
+        small, _ = self.homepage_queries()
+        self.add_rows(990)
+        count, html = self.homepage_queries()
+        self.assertEqual(count, small)
+        self.assertIn('Project 999<', html)
+        self.assertIn('Step 998<', html)
+        self.assertNotIn('Step 999<', html)
+
+
+class ContactViewTests(CacheTestCase):
+    DATA = {'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hello'}
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.patch('core.views.limiter', RateLimiter(os.path.join(directory.name, 'ratelimit.sqlite3')))
+        self.submit = self.patch('core.views.writer.submit')
+
+    def patch(self, target, *args):
+        patcher = mock.patch(target, *args)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_posts_without_csrf_token(self):
+        # Cached pages and static exports carry no token.
+        client = Client(enforce_csrf_checks=True)
+        response = client.post('/contact/', self.DATA, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 202)
+        self.submit.assert_called_once_with(**self.DATA)
+
+    def test_cached_homepage_form_posts_without_javascript(self):
+        GetInTouch.objects.create(title='Contact')
+        Sections.objects.create()
+        rebuild_snapshot()
+        client = Client(enforce_csrf_checks=True)
+        page = client.get('/')
+        self.assertNotIn('csrftoken', page.cookies)
+        self.assertContains(page, 'action="/contact/"')
+        for path in ('/contact/', '/'):
+            response = client.post(path, self.DATA)
+            self.assertRedirects(response, '/#contact', fetch_redirect_response=False)
+        self.assertEqual(self.submit.call_count, 1)
+
+    def test_json_and_redirect_responses(self):
+        response = self.client.post('/contact/', self.DATA, HTTP_ACCEPT='application/json')
+        self.assertEqual((response.status_code, response.json()), (202, {'ok': True}))
+        response = self.client.post('/contact/', {**self.DATA, 'message': 'Again'})
+        self.assertRedirects(response, '/#contact', fetch_redirect_response=False)
+        self.assertEqual(self.submit.call_count, 2)
+
+        invalid = {**self.DATA, 'email': 'not an address'}
+        response = self.client.post('/contact/', invalid, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.json()['errors'])
+        response = self.client.post('/contact/', invalid)
+        self.assertRedirects(response, '/#contact', fetch_redirect_response=False)
+        self.assertEqual(self.submit.call_count, 2)
+
+    def test_full_queue(self):
+        # Rejected for a full queue as often as the IP bucket holds, then accepted.
+        self.submit.side_effect = [queue.Full] * 5 + [None]
+        for headers in [{'HTTP_ACCEPT': 'application/json'}, {}] * 2 + [{}]:
+            response = self.client.post('/contact/', self.DATA, **headers)
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.headers['Retry-After'], '60')
+        # Not taken for a duplicate of a message that never got queued.
+        response = self.client.post('/contact/', self.DATA, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.submit.call_count, 6)
+
+
+class MessageWriterTests(TransactionTestCase):
+    def submit(self, writer, count):
+        for i in range(count):
+            writer.submit(name=f'Name {i}', email='ada@example.com', message='Hello')
+
+    def test_writes_in_batches(self):
+        writer = MessageWriter(batch_size=2, flush_interval=60)
+        with mock.patch.object(Message.objects, 'bulk_create', wraps=Message.objects.bulk_create) as bulk_create:
+            self.submit(writer, 5)
+            # The fifth message waits for the interval, or for stop().
+            writer.stop()
+        self.assertFalse(writer._thread.is_alive())
+        self.assertEqual([len(call.args[0]) for call in bulk_create.call_args_list], [2, 2, 1])
+        self.assertEqual(sorted(Message.objects.values_list('name', flat=True)), [f'Name {i}' for i in range(5)])
+
+    def test_full_queue_raises(self):
+        writer = MessageWriter(max_pending=2)
+        with mock.patch.object(writer, '_ensure_started'):
+            self.submit(writer, 2)
+            with self.assertRaises(queue.Full):
+                self.submit(writer, 1)
+        writer.stop()
+        self.assertEqual(Message.objects.count(), 2)
+
+
+@override_settings(ALLOWED_HOSTS=['a.example', 'b.example'])
+class ConditionalResponseTests(CacheTestCase):
+    def test_absolute_urls_have_an_etag_per_origin(self):
+        for path in ('/robots.txt', '/sitemap.xml'):
+            response = self.client.get(path, HTTP_HOST='a.example')
+            etag = response.headers['ETag']
+            self.assertEqual(self.client.get(path, HTTP_HOST='a.example', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            other = self.client.get(path, HTTP_HOST='b.example', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(other.status_code, 200, path)
+            self.assertIn(b'b.example', other.content)
+            self.assertEqual(self.client.get(path, HTTP_HOST='a.example', secure=True, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_or_inactive_post_is_404_not_304(self):
+        BlogPost.objects.create(title='Live', content='<p>Body</p>')
+        BlogPost.objects.create(title='Hidden', content='<p>Body</p>', is_active=False)
+        etag = self.client.get('/blog/live/', HTTP_HOST='a.example').headers['ETag']
+        self.assertEqual(self.client.get('/blog/live/', HTTP_HOST='a.example', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        for path in ('/blog/hidden/', '/blog/missing/'):
+            response = self.client.get(path, HTTP_HOST='a.example', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 404, path)
+
+
+class PortfolioAPITests(CacheTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Project.objects.create(title='Alpha', description='First')
+        rebuild_snapshot()
+
+    def test_etag_answers_304_until_content_changes(self):
+        response = self.client.get('/api/portfolio/projects/')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertEqual(self.client.get('/api/portfolio/projects/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        bump_content_version()
+        self.assertEqual(self.client.get('/api/portfolio/projects/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_fields_limit_the_response(self):
+        response = self.client.get('/api/portfolio/projects/', {'fields': 'skills,title'})
+        self.assertEqual(response.json(), [{'title': 'Alpha', 'skills': []}])
+        response = self.client.get('/api/portfolio/', {'sections': 'hero,projects', 'fields[projects]': 'title'})
+        self.assertEqual(response.json(), {'hero': None, 'projects': [{'title': 'Alpha'}]})
+        response = self.client.get('/api/portfolio/projects/', {'fields': 'title,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.json()['error'])
+
+
+class SearchTests(CacheTestCase):
+    def test_title_matches_rank_first(self):
+        body = Project.objects.create(title='Weather station', description='<p>Logs rainfall with <b>Django</b>.</p>')
+        title = Project.objects.create(title='Django blog engine', description='<p>Posts and tags.</p>')
+        Project.objects.create(title='Unrelated', description='<p>Nothing here.</p>')
+        rebuild_index()
+        results = search('django')
+        self.assertEqual([r['id'] for r in results], [title.pk, body.pk])
+        self.assertEqual(results[0]['title'], '<mark>Django</mark> blog engine')
+        self.assertIn('<mark>Django</mark>', results[1]['snippet'])
+
+    def test_only_newest_candidates_are_ranked(self):
+        projects = [Project.objects.create(title=title) for title in ('Django', 'Django in practice', 'Notes on Django')]
+        rebuild_index()
+        with mock.patch('core.search.CANDIDATE_LIMIT', 2):
+            results = search('django')
+        # The best title match is the oldest row, outside the newest two.
+        self.assertEqual({r['id'] for r in results}, {projects[1].pk, projects[2].pk})
+        self.assertEqual(search('django')[0]['id'], projects[0].pk)
+
+
+class SitemapTests(CacheTestCase):
+    def test_page_numbers_share_one_cache_entry(self):
+        BlogPost.objects.create(title='Post', content='<p>Body</p>')
+        misses = page_cache_stats()['misses']
+        for page in ('1', '01', '+1', ' 1'):
+            self.assertEqual(self.client.get('/sitemap-blog.xml', {'p': page}).status_code, 200, page)
+        self.assertEqual(page_cache_stats()['misses'], misses + 1)
+        for page in ('x', '1.5', '2', '0'):
+            self.assertEqual(self.client.get('/sitemap-blog.xml', {'p': page}).status_code, 404, page)
+        # Only the numbers reach the sitemap view, which 404s without caching.
+        self.assertEqual(page_cache_stats()['misses'], misses + 3)
+
+
+class SpriteTests(CacheTestCase):
+    ICONS = (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24"><path d="M4 4h16v16H4z"/></svg>',
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24"><circle cx="12" cy="12" r="8"/></svg>',
+    )
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        media = override_settings(MEDIA_ROOT=directory.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def publish(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return rebuild_snapshot().data[SPRITE_CONTEXT_KEY]
+
+    def test_sprite_is_rebuilt_only_when_icons_change(self):
+        Skill.objects.create(title='Square', icon=self.ICONS[0])
+        first = self.publish()
+        self.assertTrue(default_storage.exists(first))
+
+        Skill.objects.create(title='Same icon', icon=self.ICONS[0])
+        with mock.patch.object(IconSymbol.objects, 'filter') as symbols:
+            self.assertEqual(self.publish(), first)
+        symbols.assert_not_called()
+
+        Skill.objects.create(title='Circle', icon=self.ICONS[1])
+        second = self.publish()
+        self.assertNotEqual(second, first)
+        self.assertTrue(default_storage.exists(second))
+        self.assertFalse(default_storage.exists(first))
+
+        Skill.objects.all().delete()
+        self.assertEqual(self.publish(), '')
+        self.assertFalse(default_storage.exists(second))
+
+
+class SanitizeTests(SimpleTestCase):
+    def test_script_urls_are_dropped(self):
+        for href in (
+            'javascript:alert(1)', 'JaVaScRiPt:alert(1)', ' javascript:alert(1)',
+            'jav&#x61;script:alert(1)', '&#x6A;avascript&colon;alert(1)', 'java&#9;script:alert(1)',
+            '&#1;javascript:alert(1)', 'vbscript:msgbox(1)', 'data:text/html,<script>alert(1)</script>',
+        ):
+            with self.subTest(href=href):
+                self.assertEqual(sanitize_html(f'<a href="{href}">x</a>'), '<a rel="nofollow noopener">x</a>')
+
+    def test_safe_urls_are_kept(self):
+        self.assertEqual(
+            sanitize_html('<a href="https://example.com/?a=1&amp;b=2">x</a>'),
+            '<a href="https://example.com/?a=1&amp;b=2" rel="nofollow noopener">x</a>',
+        )
+        self.assertEqual(sanitize_html('<a href="mailto:me@example.com">x</a>'), '<a href="mailto:me@example.com" rel="nofollow noopener">x</a>')
+        # Protocol-relative URLs load over the page's own scheme, like the
+        # https:// URLs that are allowed anyway.
+        self.assertEqual(sanitize_html('<img src="//cdn.example.com/a.png">'), '<img src="//cdn.example.com/a.png">')
+
+    def test_event_handlers_and_unknown_attributes_are_dropped(self):
+        self.assertEqual(
+            sanitize_html('<p onclick="alert(1)" style="color: red">a</p><img src="a.png" onerror="alert(1)" ONLOAD="x">'),
+            '<p>a</p><img src="a.png">',
+        )
+
+    def test_script_style_and_noscript_are_dropped_with_content(self):
+        self.assertEqual(
+            sanitize_html('a<script>alert(1)</script><style>p {}</style><noscript><img src="x"></noscript>b'),
+            'ab',
+        )
+        self.assertEqual(sanitize_html('<SCRIPT>alert(1)</SCRIPT>c'), 'c')
+
+    def test_markup_is_escaped_and_closed(self):
+        self.assertEqual(sanitize_html('<p>1 &lt; 2 <strong>bold'), '<p>1 &lt; 2 <strong>bold</strong></p>')
+        self.assertEqual(sanitize_html('<div><iframe src="https://x"></iframe>text</div>'), 'text')
@@ -1,17 +1,33 @@
-from django.urls import path
-from . import views
+from django.urls import path, re_path
+from . import api, media, views
 from django.conf import settings
-from django.conf.urls.static import static
 
 urlpatterns = [
     # The health check path for Render
     # Make sure your views.py file has a 'health_check' function!
     path('status/', views.health_check, name='health_check'),
 
-    path('', views.index, name='index'),
+    path('', views.aindex if settings.ASYNC_INDEX else views.index, name='index'),
+    path('contact/', views.contact, name='contact'),
+    path('blog/', views.blog_list, name='blog_list'),
+    path('blog/<slug:slug>/', views.blog_detail, name='blog_detail'),
+    path('search/', views.search, name='search'),
     path('robots.txt', views.robots, name='robots'),
     path('sitemap.xml', views.sitemap, name='sitemap'),
+    path('sitemap-<slug:section>.xml', views.sitemap_section, name='sitemap_section'),
+
+    path('api/portfolio/', api.portfolio, name='api_portfolio'),
+    path('api/portfolio/<slug:section>/', api.portfolio_section, name='api_portfolio_section'),
+]
+
+# Uploaded media, in development and production alike.
+urlpatterns += [
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), media.serve, name='media'),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Hashed static files from STATIC_ROOT; runserver serves them itself in DEBUG.
+if not settings.DEBUG:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.+)$' % settings.STATIC_URL.lstrip('/'), media.serve,
+                {'document_root': settings.STATIC_ROOT, 'offload': False}, name='static'),
+    ]
@@ -1,6 +1,23 @@
-from django.shortcuts import render
-from django.http import HttpResponse
+import queue
+from datetime import datetime, timedelta, timezone
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.shortcuts import get_object_or_404, redirect, render
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
 from .models import *
+from .forms import ContactForm
+from .inbox import writer
+from .replica import reads_replica
+from .ratelimit import client_ip, limiter, submission_digest
+from .cache import acached_page_response, cached_body_response, cached_page_response, conditional_content, conditional_origin_content
+from .content import blog_cards
+from .search import search as search_index
+from .sitemaps import SITEMAPS, render_sitemap
+from .snapshot import aload_index_context, load_index_context
 
 def health_check(request):
     """
@@ -8,34 +25,157 @@ def health_check(request):
     """
     return HttpResponse("OK", status=200)
 
+@csrf_exempt
+@conditional_content
+@reads_replica
 def index(request):
-    
-    metadata = MetaData.objects.filter(is_active=True).first()
-    hero = Hero.objects.filter(is_active=True).first()
-    about = About.objects.filter(is_active=True).first()
-    process = Process.objects.filter(is_active=True).first()
-    skillgroups = SlkillGroup.objects.filter(is_active=True)
-    projects = Project.objects.filter(is_active=True)
-    blog_posts = BlogPost.objects.filter(is_active=True)
-    achievements = Achievement.objects.filter(is_active=True)
-    get_in_touch = GetInTouch.objects.filter(is_active=True).first()
-    sections = Sections.objects.all().first()
-    context = {'metadata': metadata, 'hero': hero, 'about': about,
-            'process': process, 'skillgroups': skillgroups, 'projects': projects,
-            'blog_posts': blog_posts, 'achievements': achievements,
-            'get_in_touch': get_in_touch, 'sections': sections}
-    
     if request.method == 'POST':
-        name = request.POST.get('name')
-        email = request.POST.get('email')
-        message = request.POST.get('message')
-        Message.objects.create(name=name, email=email, message=message)
-        return render(request, 'index.html', context=context)
+        # Older cached pages still post the contact form here; exempt like contact.
+        return contact(request)
+
+    # Rendered and compressed once per content version from the snapshot
+    # row, see core.cache and core.snapshot. The page is identical for every
+    # visitor and carries no CSRF token: contact doesn't need one.
+    return cached_page_response(request, 'index.html', load_index_context, name='index')
+
+@csrf_exempt
+@conditional_content
+@reads_replica
+async def aindex(request):
+    """index for ASGI deployments, see settings.ASYNC_INDEX."""
+    if request.method == 'POST':
+        return await sync_to_async(contact)(request)
+    return await acached_page_response(request, 'index.html', aload_index_context, name='index')
+
+def _wants_json(request):
+    return 'application/json' in request.headers.get('Accept', '')
+
+def _retry_later(request, message, status):
+    if _wants_json(request):
+        response = JsonResponse({'ok': False, 'errors': {'__all__': [message]}}, status=status)
+    else:
+        response = HttpResponse(message, status=status, content_type='text/plain')
+    response.headers['Retry-After'] = 60
+    return response
+
+@csrf_exempt
+@require_POST
+def contact(request):
+    """
+    Queue a contact form submission for the background writer. Answers
+    fetch() calls with JSON and plain form posts with a redirect (PRG).
+
+    Exempt from CSRF checks: the form is anonymous and changes nothing a
+    forged post could abuse, the limiter bounds what any client can send,
+    and pages without a token (static exports, see export_static) can post.
+    """
+    form = ContactForm(request.POST)
+    if not form.is_valid():
+        if _wants_json(request):
+            return JsonResponse({'ok': False, 'errors': form.errors}, status=400)
+        return redirect(reverse('index') + '#contact')
+
+    # Floods and resubmissions are turned away before any ORM work. Only a
+    # submission the writer accepted takes tokens and counts as seen.
+    try:
+        reason = limiter.check(
+            client_ip(request), submission_digest(form.cleaned_data),
+            accept=lambda: writer.submit(**form.cleaned_data),
+        )
+    except queue.Full:
+        return _retry_later(request, 'Please try again in a minute.', status=503)
+    if reason in (None, 'duplicate'):
+        # A duplicate was already queued once; report success so the
+        # visitor doesn't retry.
+        if _wants_json(request):
+            return JsonResponse({'ok': True}, status=202)
+        return redirect(reverse('index') + '#contact')
+    return _retry_later(request, 'Too many messages, please try again later.', status=429)
+
+BLOG_PAGE_SIZE = 12
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
-    return render(request, 'index.html', context=context)
+def _encode_cursor(post):
+    return f'{(post.created - EPOCH) // timedelta(microseconds=1)}-{post.pk}'
 
+def _decode_cursor(value):
+    micros, pk = (int(part) for part in value.split('-'))
+    return EPOCH + timedelta(microseconds=micros), pk
+
+@reads_replica
+def blog_list(request):
+    """
+    All active posts, newest first. Paginated by a (created, id) keyset
+    cursor so deep pages cost the same as the first one.
+    """
+    posts = blog_cards().order_by('-created', '-pk')
+    after = request.GET.get('after')
+    if after:
+        try:
+            created, pk = _decode_cursor(after)
+        except (ValueError, OverflowError):
+            return HttpResponseBadRequest('Invalid cursor.')
+        posts = posts.filter(Q(created__lt=created) | Q(created=created, pk__lt=pk))
+
+    posts = list(posts[:BLOG_PAGE_SIZE + 1])
+    next_cursor = _encode_cursor(posts[BLOG_PAGE_SIZE - 1]) if len(posts) > BLOG_PAGE_SIZE else None
+    context = load_index_context()
+    context.update(blog_posts=posts[:BLOG_PAGE_SIZE], next_cursor=next_cursor, is_paginated=bool(after))
+    return render(request, 'blog_list.html', context)
+
+def _blog_detail_context(slug):
+    post = get_object_or_404(BlogPost.objects.defer('content'), slug=slug, is_active=True)
+    context = load_index_context()
+    context['post'] = post
+    return context
+
+@reads_replica
+def blog_detail(request, slug):
+    # Looked up before the conditional check, which would answer any slug with 304.
+    if not BlogPost.objects.filter(slug=slug, is_active=True).exists():
+        raise Http404('No such post.')
+    return _blog_detail_response(request, slug)
+
+@conditional_content
+def _blog_detail_response(request, slug):
+    return cached_page_response(request, 'blog_detail.html', lambda: _blog_detail_context(slug), name=f'blog:{slug}')
+
+@require_GET
+def search(request):
+    """Full-text search over projects, articles, skills and achievements."""
+    query = request.GET.get('q', '').strip()
+    results = search_index(query) if query else []
+    if _wants_json(request):
+        return JsonResponse({'query': query, 'results': results})
+    context = load_index_context()
+    context.update(query=query, results=results)
+    return render(request, 'search.html', context)
+
+@conditional_origin_content
 def robots(request):
-    return render(request, 'robots.txt', content_type='text/plain')
+    sitemap_url = request.build_absolute_uri(reverse('sitemap'))
+    return render(request, 'robots.txt', {'sitemap_url': sitemap_url}, content_type='text/plain')
 
+def _sitemap_response(request, name, section=None):
+    # Absolute URLs inside, so the cached bytes are per scheme and host.
+    name = f'sitemap:{request.scheme}://{request.get_host()}:{name}'
+    response = cached_body_response(request, name, lambda: render_sitemap(request, section), content_type='application/xml')
+    response.headers['X-Robots-Tag'] = 'noindex, noarchive'
+    return response
+
+@conditional_origin_content
+@reads_replica
 def sitemap(request):
-    return render(request, 'sitemap.xml', content_type='text/xml')
+    return _sitemap_response(request, 'root')
+
+@conditional_origin_content
+@reads_replica
+def sitemap_section(request, section):
+    if section not in SITEMAPS:
+        raise Http404(f'No sitemap section {section!r}.')
+    # Parsed before it becomes part of the cache key, or any string would add an entry.
+    try:
+        page = int(request.GET.get('p', '1'))
+    except ValueError:
+        raise Http404('Invalid sitemap page.')
+    return _sitemap_response(request, f'{section}:{page}', section)
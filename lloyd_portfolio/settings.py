@@ -34,6 +34,13 @@ ALLOWED_HOSTS = ['127.0.0.1', 'localhost', 'my-portfolio-a77w.onrender.com', 'mr
 RENDER_EXTERNAL_HOSTNAME = os.environ.get('RENDER_EXTERNAL_HOSTNAME')
 if RENDER_EXTERNAL_HOSTNAME:
     ALLOWED_HOSTS.append(RENDER_EXTERNAL_HOSTNAME)
+# Render's proxy appends the client address to X-Forwarded-For; REMOTE_ADDR
+# is the proxy itself. Used by the contact form rate limiter.
+USE_X_FORWARDED_FOR = RENDER_EXTERNAL_HOSTNAME is not None
+# TLS ends at that proxy too; trust its scheme so absolute URLs (robots.txt,
+# sitemap.xml) use https.
+if RENDER_EXTERNAL_HOSTNAME:
+    SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
 # CSRF_TRUSTED_ORIGINS is also required for production.
 CSRF_TRUSTED_ORIGINS = ['https://my-portfolio-a77w.onrender.com', 'https://mrlloyd.pythonanywhere.com']
@@ -47,6 +54,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
 
     'core.apps.CoreConfig',
 ]
@@ -57,6 +65,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.replica.PinPrimaryMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -80,6 +89,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'lloyd_portfolio.wsgi.application'
 
+# Serve the homepage with the async view. Off by default: on this stack it is
+# slower than index even under ASGI (see benchmark_index); opt in with ASYNC_INDEX=True.
+ASYNC_INDEX = os.getenv('ASYNC_INDEX') == 'True'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -88,9 +101,67 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Reuse connections across requests; core.db checks them first.
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Writers take the lock at BEGIN instead of failing to upgrade a
+            # read lock with "database is locked" halfway through.
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    # Copy of default for public pages, written by core.replica after every
+    # publish. Immutable: SQLite skips locking and change detection, and a
+    # refresh swaps in a new file instead of changing this one.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'file:%s?mode=ro&immutable=1' % os.path.join(BASE_DIR, 'db.replica.sqlite3'),
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'uri': True},
+        'PRAGMAS': {
+            'query_only': 1,
+            'cache_size': -16000,
+            'mmap_size': 64 * 1024 * 1024,
+            'temp_store': 'memory',
+        },
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['core.replica.ReplicaRouter']
+
+# Run on every new SQLite connection by core.db; a database can override
+# them with a 'PRAGMAS' entry. WAL lets readers carry on while the contact
+# form writes. With WAL, synchronous=NORMAL can only lose the last commits
+# on power loss, never corrupt the file. `manage.py benchmark_db` compares
+# these settings with SQLite's defaults.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    # Negative: KiB rather than pages.
+    'cache_size': -16000,
+    'mmap_size': 64 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# File based so every gunicorn worker sees the same rendered pages and
+# content version.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
     }
 }
 
+# Swaps in an in-memory cache for the test suite.
+TEST_RUNNER = 'core.testing.TestRunner'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -133,6 +204,19 @@ STATICFILES_DIRS = [os.path.join(BASE_DIR, "statics")]
 MEDIA_URL = '/media/'
 MEDIA_ROOT =  os.path.join(BASE_DIR, "media")
 
+# Uploads and collected static files get content-hashed names so both can
+# be cached forever. `manage.py build_assets` compiles the CSS and collects.
+STORAGES = {
+    'default': {'BACKEND': 'core.storage.HashedMediaStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'},
+}
+
+# How core.media hands files to the front server: 'x-accel-redirect' (nginx,
+# with an internal location at MEDIA_ACCEL_PREFIX aliasing MEDIA_ROOT),
+# 'x-sendfile' (Apache, lighttpd), or unset to stream them from Django.
+MEDIA_SENDFILE = os.getenv('MEDIA_SENDFILE') or None
+MEDIA_ACCEL_PREFIX = os.getenv('MEDIA_ACCEL_PREFIX', '/protected-media/')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -9,7 +9,8 @@ source $(which virtualenvwrapper.sh)
 
 mkvirtualenv portfolio-venv --python=python3.12
 pip install -r requirements.txt
-python manage.py collectstatic
+npm install
+python manage.py build_assets
 
 echo "SECRET_KEY='$(python -c 'from django.core.management.utils import get_random_secret_key; print(get_random_secret_key())')'" > .env
 echo "DEBUG='False'" >> .env
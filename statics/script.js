@@ -15,7 +15,7 @@ document.addEventListener('DOMContentLoaded', () => {
     // Theme toggle button functionality
     const themeToggle = document.getElementById('theme-toggle');
     
-    themeToggle.addEventListener('click', (e) => {
+    themeToggle?.addEventListener('click', (e) => {
         e.preventDefault();
         if (document.body.classList.contains('light-mode')) {
             document.body.classList.remove('light-mode');
@@ -101,4 +101,31 @@ document.addEventListener('DOMContentLoaded', () => {
     timelineItems.forEach((item, index) => {
         item.style.setProperty('--item-index', index + 1);
     });
-});
\ No newline at end of file
+});
+
+// Send the contact form with fetch() instead of a full page reload
+document.addEventListener('DOMContentLoaded', () => {
+    const form = document.getElementById('contact-form');
+    const status = document.getElementById('contact-status');
+    if (!form) return;
+
+    form.addEventListener('submit', async (e) => {
+        e.preventDefault();
+        status.textContent = 'Sending...';
+        try {
+            const response = await fetch(form.action, {
+                method: 'POST',
+                body: new FormData(form),
+                headers: { 'Accept': 'application/json' },
+            });
+            if (response.ok) {
+                form.reset();
+                status.textContent = 'Thanks! Your message has been sent.';
+            } else {
+                status.textContent = 'Please check the form and try again.';
+            }
+        } catch (err) {
+            status.textContent = 'Network error, please try again.';
+        }
+    });
+});
@@ -3,6 +3,9 @@ module.exports = {
   content: [
     "./templates/**/*.{html,js}",
     "./templates/*.{html,js}",
+    "./statics/*.js",
+    // Class names in admin-entered HTML, written by `manage.py build_assets`.
+    "./cache/tailwind/db-classes.html",
   ],
   theme: {
     extend: {},